@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark: motor de threads vs motor asíncrono contra un servidor HTTP local
+Desarrollado por: NEZUKO
+Versión: 2.0 Pro
+"""
+
+import io
+import os
+import sys
+import time
+import json
+import argparse
+import tempfile
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dirforcer_improved import DirForcerPro
+from mock_server import MockServer
+
+
+def create_wordlist(size, existing):
+    """Crear una wordlist temporal con `size` entradas"""
+    fd, path = tempfile.mkstemp(prefix='dirforcer_bench_', suffix='.txt')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        for word in existing:
+            f.write(f"{word}\n")
+        for i in range(size - len(existing)):
+            f.write(f"noexiste{i}\n")
+    return path
+
+
+def run_engine(engine, url, wordlist, concurrency):
+    """Ejecutar un escaneo completo y devolver sus métricas"""
+    dirforcer = DirForcerPro()
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        dirforcer.scan(url, wordlist, engine=engine, threads=concurrency,
+                       status_codes=[200])
+    elapsed = time.perf_counter() - start
+    return {
+        'engine': engine,
+        'concurrency': concurrency,
+        'requests': dirforcer.total_requests,
+        'found': len(dirforcer.found_dirs),
+        'elapsed': round(elapsed, 3),
+        'requests_per_second': round(dirforcer.total_requests / elapsed, 1) if elapsed else 0
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Comparar los motores threads y async de DirForcer Pro")
+    parser.add_argument('--words', type=int, default=2000, help='Entradas de la wordlist (default: 2000)')
+    parser.add_argument('--latency', type=float, default=0.02, help='Latencia simulada del servidor (default: 0.02)')
+    parser.add_argument('--threads', type=int, default=50, help='Concurrencia del motor de threads (default: 50)')
+    parser.add_argument('--async-concurrency', type=int, default=500,
+                        help='Concurrencia del motor async (default: 500)')
+    args = parser.parse_args()
+
+    existing = ['admin', 'login', 'backup']
+    wordlist = create_wordlist(args.words, existing)
+    results = []
+    try:
+        with MockServer(existing, latency=args.latency) as server:
+            results.append(run_engine('threads', server.url, wordlist, args.threads))
+            results.append(run_engine('async', server.url, wordlist, args.async_concurrency))
+    finally:
+        os.remove(wordlist)
+
+    for result in results:
+        if result['found'] != len(existing):
+            print(f"[!] El motor {result['engine']} encontró {result['found']} de {len(existing)} rutas",
+                  file=sys.stderr)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
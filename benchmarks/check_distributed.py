@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Comprobación del modo distribuido: un coordinador y N workers en localhost contra un
+MockServer con errores, verificando la salida y el rechazo de POST /complete mal formados
+Desarrollado por: NEZUKO
+Versión: 2.0 Pro
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import tempfile
+import subprocess
+
+import requests
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SCANNER = os.path.join(os.path.dirname(BENCH_DIR), 'dirforcer_improved.py')
+
+from mock_server import MockServer
+
+EXISTING_PATHS = [f"existe{i}" for i in range(20)]
+
+# Cuerpos de POST /complete que el coordinador debe rechazar con 400 (no con un 500)
+MALFORMED_COMPLETIONS = [
+    [],
+    {'chunk': 'x', 'results': 'no-es-una-lista'},
+    {'chunk': 'x', 'results': [{'url': 'http://x/'}]},
+    {'chunk': 'x', 'results': [], 'stats': {'started': 'muchos'}},
+]
+
+
+def free_port():
+    """Puerto TCP libre en localhost para el coordinador"""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_coordinator(url, timeout=30.0):
+    """Esperar a que el coordinador acepte conexiones (calibra antes de escuchar)"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            requests.post(f"{url}/heartbeat", json={}, timeout=1)
+            return True
+        except requests.exceptions.ConnectionError:
+            time.sleep(0.2)
+    return False
+
+
+def check_malformed(url):
+    """Estados devueltos por el coordinador a los POST /complete mal formados"""
+    return [requests.post(f"{url}/complete", json=body, timeout=5).status_code for body in MALFORMED_COMPLETIONS]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Comprobar un coordinador con N workers en localhost")
+    parser.add_argument('--workers', type=int, default=3, help='Número de workers (default: 3)')
+    parser.add_argument('--words', type=int, default=5000, help='Tamaño de la wordlist (default: 5000)')
+    parser.add_argument('--chunk-size', type=int, default=200, help='Requests por chunk (default: 200)')
+    parser.add_argument('--engine', choices=['threads', 'async'], default='threads',
+                        help='Motor de los workers (default: threads)')
+    parser.add_argument('--error-rate', type=float, default=0.02,
+                        help='Fracción de respuestas 503 (se reintentan) del servidor (default: 0.02)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='dirforcer_distributed_') as workdir, \
+            MockServer(EXISTING_PATHS, error_rate=args.error_rate, error_status=503, seed=0) as server:
+        wordlist = os.path.join(workdir, 'wordlist.txt')
+        with open(wordlist, 'w', encoding='utf-8') as f:
+            step = args.words // len(EXISTING_PATHS)
+            for i in range(args.words):
+                f.write(f"{EXISTING_PATHS[i // step]}\n" if i % step == 0 else f"noexiste{i}\n")
+        output = os.path.join(workdir, 'results.jsonl')
+        address = f"127.0.0.1:{free_port()}"
+        coordinator_url = f"http://{address}"
+
+        start = time.perf_counter()
+        coordinator = subprocess.Popen(
+            [sys.executable, SCANNER, '-d', server.url, '-w', wordlist, '--status-codes', '200',
+             '--coordinator', address, '--chunk-size', str(args.chunk_size), '-o', output,
+             '--no-hit-stats'],
+            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+        )
+        if not wait_for_coordinator(coordinator_url):
+            coordinator.kill()
+            print("FALLO: el coordinador no llegó a escuchar")
+            sys.exit(1)
+        malformed = check_malformed(coordinator_url)
+
+        workers = [
+            subprocess.Popen([sys.executable, SCANNER, '--worker', coordinator_url, '-t', '20',
+                              '--engine', args.engine, '--no-hit-stats'],
+                             stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            for _ in range(args.workers)
+        ]
+        coordinator_error = coordinator.communicate(timeout=300)[1]
+        for worker in workers:
+            worker.wait(timeout=60)
+        elapsed = time.perf_counter() - start
+
+        rows = []
+        if os.path.exists(output):
+            with open(output, 'r', encoding='utf-8') as f:
+                rows = [json.loads(line)['directory'] for line in f if line.strip()]
+
+    checks = {
+        'coordinador terminado sin error': coordinator.returncode == 0,
+        'workers terminados sin error': all(worker.returncode == 0 for worker in workers),
+        'POST /complete mal formados -> 400': malformed == [400] * len(MALFORMED_COMPLETIONS),
+        'sin hallazgos duplicados': len(rows) == len(set(rows)),
+        'todas las rutas encontradas': set(rows) == set(EXISTING_PATHS),
+    }
+    print(f"{args.workers} workers ({args.engine}), {args.words} palabras en {elapsed:.1f}s; "
+          f"{len(rows)} hallazgos, estados mal formados: {malformed}")
+    for name, ok in checks.items():
+        print(f"  {'OK   ' if ok else 'FALLO'} {name}")
+    if coordinator.returncode != 0:
+        print(coordinator_error.strip().splitlines()[-1:] or '')
+    sys.exit(0 if all(checks.values()) else 1)
+
+
+if __name__ == "__main__":
+    main()
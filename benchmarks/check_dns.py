@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Comprobación de la caché DNS: un host con varias direcciones cuya primera rechaza las
+conexiones debe escanearse igual que con socket.create_connection (threads, async y HTTP/2)
+Desarrollado por: NEZUKO
+Versión: 2.0 Pro
+"""
+
+import io
+import os
+import sys
+import socket
+import argparse
+import tempfile
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import dirforcer_improved
+from dirforcer_improved import DirForcerPro, DNS_CACHE
+from mock_server import MockServer, MockH2Server
+from run_benchmarks import create_certificate
+
+EXISTING_PATHS = ['admin', 'login', 'backup']
+HOSTNAME = 'multi.dirforcer.test'
+# 127.0.0.2 no tiene nada escuchando: conexión rechazada
+ADDRESSES = ['127.0.0.2', '127.0.0.1']
+
+real_getaddrinfo = socket.getaddrinfo
+
+
+def fake_getaddrinfo(host, port, *args, **kwargs):
+    """Resolver HOSTNAME a varias IPs, la primera muerta"""
+    if host == HOSTNAME:
+        return [(socket.AF_INET, socket.SOCK_STREAM, socket.IPPROTO_TCP, '', (ip, port)) for ip in ADDRESSES]
+    return real_getaddrinfo(host, port, *args, **kwargs)
+
+
+def check_engine(engine, server, wordlist, http2=False):
+    """Escanear el host multi-dirección; devuelve (rutas encontradas, errores)"""
+    url = server.url.replace('127.0.0.1', HOSTNAME)
+    DNS_CACHE.entries.clear()
+    dirforcer = DirForcerPro()
+    with redirect_stdout(io.StringIO()):
+        dirforcer.scan(url, wordlist, engine=engine, threads=10, status_codes=[200], verify_ssl=False,
+                       timeout=5, http2=http2)
+    return {result['directory'] for result in dirforcer.found_dirs}, dirforcer.stats.snapshot()['errors']
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Comprobar la caché DNS con un host de varias direcciones")
+    parser.add_argument('--words', type=int, default=200, help='Tamaño de la wordlist (default: 200)')
+    args = parser.parse_args()
+
+    socket.getaddrinfo = fake_getaddrinfo
+    failed = False
+    with tempfile.TemporaryDirectory(prefix='dirforcer_dns_') as workdir:
+        wordlist = os.path.join(workdir, 'wordlist.txt')
+        with open(wordlist, 'w', encoding='utf-8') as f:
+            for word in EXISTING_PATHS:
+                f.write(f"{word}\n")
+            for i in range(args.words - len(EXISTING_PATHS)):
+                f.write(f"noexiste{i}\n")
+
+        runs = [('threads', MockServer, {}), ('async', MockServer, {})]
+        certificate = create_certificate(workdir)
+        if dirforcer_improved.httpx is not None and certificate is not None:
+            runs.append(('http2', MockH2Server, {'certfile': certificate[0], 'keyfile': certificate[1]}))
+
+        for name, server_class, options in runs:
+            with server_class(EXISTING_PATHS, **options) as server:
+                found, errors = check_engine('async' if name == 'http2' else name, server, wordlist,
+                                             http2=name == 'http2')
+            ok = found == set(EXISTING_PATHS) and errors == 0
+            failed = failed or not ok
+            print(f"{name:<8} encontradas: {len(found)}/{len(EXISTING_PATHS)}  errores: {errors:>3}  "
+                  f"{'OK' if ok else 'FALLO'}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
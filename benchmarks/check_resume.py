@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Comprobación de --resume: interrumpir un escaneo justo al emitir hallazgos, reanudarlo
+y verificar que la salida en streaming no tiene filas duplicadas ni le faltan rutas
+Desarrollado por: NEZUKO
+Versión: 2.0 Pro
+"""
+
+import io
+import os
+import sys
+import json
+import argparse
+import tempfile
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dirforcer_improved import DirForcerPro
+from mock_server import MockServer
+
+EXISTING_PATHS = [f"existe{i}" for i in range(50)]
+
+
+class InterruptedDirForcer(DirForcerPro):
+    """Simula un Ctrl+C que llega mientras se emite el hallazgo número `stop_after`"""
+
+    def __init__(self, stop_after):
+        super().__init__()
+        self.stop_after = stop_after
+        self.emitted = 0
+
+    def handle_found(self, result, base_url, depth, frontier, word=None):
+        child = super().handle_found(result, base_url, depth, frontier, word)
+        self.emitted += 1
+        if self.emitted == self.stop_after:
+            self.stop_scanning = True
+        return child
+
+
+def check_engine(engine, url, wordlist, workdir, stop_after):
+    """Escaneo interrumpido + reanudación; devuelve (filas, únicas, rutas encontradas)"""
+    output = os.path.join(workdir, f"{engine}.jsonl")
+    checkpoint = os.path.join(workdir, f"{engine}.checkpoint")
+    options = dict(engine=engine, threads=20, status_codes=[200], output_file=output,
+                   checkpoint=checkpoint, calibrate=False)
+    with redirect_stdout(io.StringIO()):
+        InterruptedDirForcer(stop_after).scan(url, wordlist, **options)
+        DirForcerPro().scan(url, wordlist, resume=True, **options)
+
+    with open(output, 'r', encoding='utf-8') as f:
+        rows = [json.loads(line)['directory'] for line in f if line.strip()]
+    return len(rows), len(set(rows)), set(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Comprobar que --resume no duplica hallazgos")
+    parser.add_argument('--engines', nargs='+', default=['threads', 'async'],
+                        help='Motores a comprobar (default: threads async)')
+    parser.add_argument('--words', type=int, default=2000, help='Tamaño de la wordlist (default: 2000)')
+    parser.add_argument('--stop-after', type=int, default=10,
+                        help='Hallazgo en el que se interrumpe el primer escaneo (default: 10)')
+    args = parser.parse_args()
+
+    failed = False
+    with tempfile.TemporaryDirectory(prefix='dirforcer_resume_') as workdir, MockServer(EXISTING_PATHS) as server:
+        wordlist = os.path.join(workdir, 'wordlist.txt')
+        with open(wordlist, 'w', encoding='utf-8') as f:
+            # Hallazgos repartidos por la wordlist para que la interrupción deje trabajo pendiente
+            step = args.words // len(EXISTING_PATHS)
+            for i in range(args.words):
+                f.write(f"{EXISTING_PATHS[i // step]}\n" if i % step == 0 else f"noexiste{i}\n")
+
+        for engine in args.engines:
+            rows, unique, found = check_engine(engine, server.url, wordlist, workdir, args.stop_after)
+            ok = rows == unique and found == set(EXISTING_PATHS)
+            failed = failed or not ok
+            print(f"{engine:<10} filas: {rows:>4}  únicas: {unique:>4}  esperadas: {len(EXISTING_PATHS):>4}  "
+                  f"{'OK' if ok else 'FALLO'}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
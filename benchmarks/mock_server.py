@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+Servidor HTTP local que simula un objetivo para los benchmarks de DirForcer Pro
+Desarrollado por: NEZUKO
+Versión: 2.0 Pro
+"""
+
+import ssl
+import sys
+import time
+import random
+import asyncio
+import threading
+import argparse
+from http import HTTPStatus
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+try:
+    import h2.config
+    import h2.events
+    import h2.exceptions
+    import h2.connection
+except ImportError:
+    # Solo necesario para MockH2Server (pip install h2)
+    h2 = None
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 para que los clientes puedan reutilizar conexiones (keep-alive)
+    protocol_version = 'HTTP/1.1'
+    # Cabeceras y cuerpo van en escrituras separadas: sin TCP_NODELAY el ACK
+    # retardado añade ~40 ms a cada respuesta en conexiones reutilizadas
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        """Responder 200 para las rutas conocidas y 404 para el resto"""
+        self.respond(send_body=True)
+
+    def do_HEAD(self):
+        """Igual que GET pero sin cuerpo"""
+        self.respond(send_body=False)
+
+    def respond(self, send_body):
+        """Construir la respuesta simulada"""
+        server = self.server
+        if server.latency > 0:
+            time.sleep(server.latency)
+
+        response = server.build_response(self.path)
+        if response is None:
+            # Cortar la conexión sin responder (reset / timeout del lado del cliente)
+            self.close_connection = True
+            return
+        status, body = response
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        """Silenciar el log de acceso"""
+        pass
+
+
+class MockResponder:
+    """Respuestas simuladas, comunes a los servidores HTTP/1.1 y HTTP/2"""
+    max_rps = 0
+    error_rate = 0.0
+    error_status = 500
+    drop_rate = 0.0
+
+    def configure(self, existing_paths=None, latency=0.0, body_size=1024, wildcard=False, max_rps=0,
+                  not_found_size=9, error_rate=0.0, drop_rate=0.0, seed=None, error_status=500):
+        self.max_rps = max_rps
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.drop_rate = drop_rate
+        self.random = random.Random(seed)
+        self.not_found_body = b'Not Found'.ljust(not_found_size, b' ')
+        self.rate_lock = threading.Lock()
+        self.rate_second, self.rate_count = 0, 0
+        self.existing_paths = set(existing_paths or [])
+        self.wildcard = wildcard
+        self.latency = latency
+        self.body = b'A' * body_size
+
+    def build_response(self, path):
+        """(status, cuerpo) para la ruta pedida, o None para cortar sin responder"""
+        path = path.lstrip('/').rstrip('/')
+        fault = self.random_fault()
+        if fault == 'drop':
+            return None
+        if fault == 'error':
+            return self.error_status, HTTPStatus(self.error_status).phrase.encode()
+        if self.over_rate_limit():
+            return 429, b'Too Many Requests'
+        if path in self.existing_paths:
+            return 200, self.body
+        if self.wildcard:
+            # Soft-404: 200 para cualquier ruta, reflejando la ruta pedida
+            return 200, f'<html><body>La página {path} no existe</body></html>'.encode()
+        return 404, self.not_found_body
+
+    def random_fault(self):
+        """Decidir si este request falla: 'error' (error_status), 'drop' (sin respuesta) o None"""
+        if not (self.error_rate or self.drop_rate):
+            return None
+        roll = self.random.random()
+        if roll < self.drop_rate:
+            return 'drop'
+        if roll < self.drop_rate + self.error_rate:
+            return 'error'
+        return None
+
+    def over_rate_limit(self):
+        """Comprobar si se supera el límite de requests por segundo del servidor"""
+        if not self.max_rps:
+            return False
+        with self.rate_lock:
+            second = int(time.monotonic())
+            if second != self.rate_second:
+                self.rate_second, self.rate_count = second, 0
+            self.rate_count += 1
+            return self.rate_count > self.max_rps
+
+
+class MockHTTPServer(MockResponder, ThreadingHTTPServer):
+    # Backlog amplio para aceptar cientos de conexiones simultáneas
+    request_queue_size = 1024
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        """Ignorar conexiones cerradas por el cliente (modos head/stream)"""
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class MockServer:
+    def __init__(self, existing_paths=None, latency=0.0, body_size=1024, wildcard=False,
+                 max_rps=0, host='127.0.0.1', port=0, not_found_size=9, error_rate=0.0,
+                 drop_rate=0.0, certfile=None, keyfile=None, seed=None, error_status=500):
+        self.httpd = MockHTTPServer((host, port), MockHandler)
+        self.tls = certfile is not None
+        if self.tls:
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(certfile, keyfile)
+            # El handshake se hace en el thread de cada conexión, no en el bucle de accept
+            self.httpd.socket = context.wrap_socket(self.httpd.socket, server_side=True,
+                                                    do_handshake_on_connect=False)
+        self.httpd.configure(existing_paths, latency, body_size, wildcard, max_rps,
+                             not_found_size, error_rate, drop_rate, seed, error_status)
+        self.thread = None
+
+    @property
+    def url(self):
+        """URL base del servidor"""
+        host, port = self.httpd.server_address[:2]
+        return f"{'https' if self.tls else 'http'}://{host}:{port}"
+
+    def start(self):
+        """Arrancar el servidor en un thread en segundo plano"""
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        """Detener el servidor"""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class H2Protocol(asyncio.Protocol):
+    """Una conexión HTTP/2: cada stream se responde en su propia tarea"""
+
+    def __init__(self, responder, max_streams):
+        self.responder = responder
+        self.conn = h2.connection.H2Connection(
+            config=h2.config.H2Configuration(client_side=False, header_encoding='utf-8'))
+        self.conn.local_settings.max_concurrent_streams = max_streams
+        # Datos pendientes por stream cuando se agota la ventana de control de flujo
+        self.pending = {}
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.conn.initiate_connection()
+        self.transport.write(self.conn.data_to_send())
+
+    def data_received(self, data):
+        try:
+            events = self.conn.receive_data(data)
+        except h2.exceptions.ProtocolError:
+            self.transport.write(self.conn.data_to_send())
+            self.transport.close()
+            return
+        for event in events:
+            if isinstance(event, h2.events.RequestReceived):
+                asyncio.ensure_future(self.respond(event.stream_id, dict(event.headers)))
+            elif isinstance(event, h2.events.WindowUpdated):
+                streams = list(self.pending) if event.stream_id == 0 else [event.stream_id]
+                for stream_id in streams:
+                    self.send_pending(stream_id)
+            elif isinstance(event, h2.events.StreamReset):
+                self.pending.pop(event.stream_id, None)
+        self.transport.write(self.conn.data_to_send())
+
+    async def respond(self, stream_id, headers):
+        """Construir la respuesta simulada de un stream"""
+        if self.responder.latency > 0:
+            # Sin bloquear: los demás streams de la conexión siguen avanzando
+            await asyncio.sleep(self.responder.latency)
+        if self.transport.is_closing():
+            return
+
+        response = self.responder.build_response(headers[':path'])
+        try:
+            if response is None:
+                self.conn.reset_stream(stream_id)
+            else:
+                status, body = response
+                send_body = headers[':method'] != 'HEAD' and body
+                self.conn.send_headers(stream_id, [(':status', str(status)), ('content-type', 'text/html'),
+                                                   ('content-length', str(len(body)))],
+                                       end_stream=not send_body)
+                if send_body:
+                    self.pending[stream_id] = body
+                    self.send_pending(stream_id)
+        except (h2.exceptions.StreamClosedError, h2.exceptions.ProtocolError):
+            self.pending.pop(stream_id, None)
+        self.transport.write(self.conn.data_to_send())
+
+    def send_pending(self, stream_id):
+        """Enviar lo que permita la ventana de control de flujo del stream"""
+        data = self.pending.get(stream_id)
+        while data:
+            window = min(self.conn.local_flow_control_window(stream_id), self.conn.max_outbound_frame_size)
+            if window <= 0:
+                break
+            chunk, data = data[:window], data[window:]
+            self.conn.send_data(stream_id, chunk, end_stream=not data)
+        if data:
+            self.pending[stream_id] = data
+        else:
+            self.pending.pop(stream_id, None)
+
+    def connection_lost(self, exc):
+        self.pending.clear()
+
+
+class MockH2Server:
+    """Igual que MockServer pero sobre HTTP/2 con TLS (ALPN h2); requiere el paquete h2"""
+
+    def __init__(self, existing_paths=None, latency=0.0, body_size=1024, wildcard=False,
+                 max_rps=0, host='127.0.0.1', port=0, not_found_size=9, error_rate=0.0,
+                 drop_rate=0.0, certfile=None, keyfile=None, seed=None, max_streams=100,
+                 error_status=500):
+        if h2 is None:
+            raise RuntimeError("MockH2Server requiere el paquete h2 (pip install h2)")
+        if certfile is None:
+            raise ValueError("MockH2Server necesita certfile/keyfile: los clientes negocian h2 por ALPN")
+        self.responder = MockResponder()
+        self.responder.configure(existing_paths, latency, body_size, wildcard, max_rps,
+                                 not_found_size, error_rate, drop_rate, seed, error_status)
+        self.context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        self.context.load_cert_chain(certfile, keyfile)
+        self.context.set_alpn_protocols(['h2'])
+        self.host, self.port = host, port
+        self.max_streams = max_streams
+        self.loop = asyncio.new_event_loop()
+        self.server = None
+        self.thread = None
+
+    @property
+    def url(self):
+        """URL base del servidor"""
+        return f"https://{self.host}:{self.port}"
+
+    def start(self):
+        """Arrancar el servidor en un thread en segundo plano"""
+        self.server = self.loop.run_until_complete(self.loop.create_server(
+            lambda: H2Protocol(self.responder, self.max_streams), self.host, self.port,
+            ssl=self.context, backlog=1024))
+        self.port = self.server.sockets[0].getsockname()[1]
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        """Detener el servidor"""
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.server.close()
+        self.loop.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor HTTP local para benchmarks de DirForcer Pro")
+    parser.add_argument('--port', type=int, default=8000, help='Puerto de escucha (default: 8000)')
+    parser.add_argument('--latency', type=float, default=0.0, help='Latencia por request en segundos (default: 0)')
+    parser.add_argument('--body-size', type=int, default=1024, help='Tamaño de las respuestas 200 en bytes (default: 1024)')
+    parser.add_argument('--wildcard', action='store_true', help='Responder 200 a cualquier ruta (soft-404)')
+    parser.add_argument('--max-rps', type=int, default=0,
+                        help='Responder 429 por encima de N requests por segundo (default: sin límite)')
+    parser.add_argument('--not-found-size', type=int, default=9,
+                        help='Tamaño de las respuestas 404 en bytes (default: 9)')
+    parser.add_argument('--error-rate', type=float, default=0.0,
+                        help='Fracción de requests que fallan con --error-status (default: 0)')
+    parser.add_argument('--error-status', type=int, default=500,
+                        help='Código de estado de los errores simulados (default: 500)')
+    parser.add_argument('--drop-rate', type=float, default=0.0,
+                        help='Fracción de requests que cortan la conexión sin responder (default: 0)')
+    parser.add_argument('--certfile', help='Certificado para servir HTTPS')
+    parser.add_argument('--keyfile', help='Clave privada del certificado')
+    parser.add_argument('--http2', action='store_true',
+                        help='Servir HTTP/2 (requiere --certfile/--keyfile y el paquete h2)')
+    parser.add_argument('--paths', nargs='*', default=['admin', 'login', 'backup'],
+                        help='Rutas que existen en el servidor')
+    args = parser.parse_args()
+
+    server_class = MockH2Server if args.http2 else MockServer
+    server = server_class(args.paths, args.latency, args.body_size, args.wildcard, args.max_rps,
+                          port=args.port, not_found_size=args.not_found_size, error_rate=args.error_rate,
+                          drop_rate=args.drop_rate, certfile=args.certfile, keyfile=args.keyfile,
+                          error_status=args.error_status)
+    if args.http2:
+        server.start()
+    print(f"Servidor de pruebas escuchando en {server.url}")
+    try:
+        if args.http2:
+            server.thread.join()
+        else:
+            server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Suite de benchmarks de DirForcer Pro contra un servidor HTTP local configurable
+Desarrollado por: NEZUKO
+Versión: 2.0 Pro
+
+Cada escenario se ejecuta en un proceso aparte (para medir RSS máximo y tiempo de
+CPU solo del escáner) contra un MockServer que corre en este proceso. El resultado
+es un JSON pensado para guardarse y compararse entre ejecuciones (--compare).
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import subprocess
+from contextlib import redirect_stdout
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:
+    # Windows: sin getrusage no se mide RSS ni CPU
+    resource = None
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from mock_server import MockServer, MockH2Server
+
+EXISTING_PATHS = ['admin', 'login', 'backup']
+
+# Escenarios estándar: name -> parámetros del escaneo y del servidor
+SCENARIOS = [
+    {'name': 'threads-10k-plain', 'engine': 'threads', 'words': 10_000, 'concurrency': 50},
+    {'name': 'async-10k-plain', 'engine': 'async', 'words': 10_000, 'concurrency': 200},
+    {'name': 'threads-10k-tls', 'engine': 'threads', 'words': 10_000, 'concurrency': 50, 'tls': True},
+    {'name': 'async-10k-tls', 'engine': 'async', 'words': 10_000, 'concurrency': 200, 'tls': True},
+    # Mismo escenario multiplexado sobre HTTP/2 (servidor h2 con ALPN)
+    {'name': 'http2-10k-tls', 'engine': 'async', 'http2': True, 'words': 10_000, 'concurrency': 200,
+     'tls': True},
+    # Con REQUESTS_CA_BUNDLE / CURL_CA_BUNDLE presentes: la calibración (requests) no debe
+    # afectar a la verificación TLS de aiohttp ni de httpx con --no-ssl-verify
+    {'name': 'async-10k-tls-ca-env', 'engine': 'async', 'words': 10_000, 'concurrency': 200, 'tls': True,
+     'ca_env': True, 'timeout': 5},
+    {'name': 'http2-10k-tls-ca-env', 'engine': 'async', 'http2': True, 'words': 10_000, 'concurrency': 200,
+     'tls': True, 'ca_env': True, 'timeout': 5},
+    {'name': 'async-10k-wildcard', 'engine': 'async', 'words': 10_000, 'concurrency': 200, 'wildcard': True},
+    {'name': 'async-10k-errors', 'engine': 'async', 'words': 10_000, 'concurrency': 200,
+     'error_rate': 0.05, 'drop_rate': 0.01},
+    {'name': 'threads-100k-plain', 'engine': 'threads', 'words': 100_000, 'concurrency': 50},
+    {'name': 'async-100k-plain', 'engine': 'async', 'words': 100_000, 'concurrency': 200},
+    {'name': 'async-1m-plain', 'engine': 'async', 'words': 1_000_000, 'concurrency': 200},
+]
+
+# Tamaño máximo de wordlist de cada suite
+SUITES = {'quick': 10_000, 'standard': 100_000, 'full': 1_000_000}
+
+
+def create_wordlist(directory, size):
+    """Crear (una sola vez por tamaño) una wordlist con `size` entradas"""
+    path = os.path.join(directory, f"wordlist_{size}.txt")
+    if not os.path.exists(path):
+        with open(path, 'w', encoding='utf-8') as f:
+            for word in EXISTING_PATHS:
+                f.write(f"{word}\n")
+            for i in range(size - len(EXISTING_PATHS)):
+                f.write(f"noexiste{i}\n")
+    return path
+
+
+def create_certificate(directory):
+    """Certificado autofirmado para los escenarios TLS (requiere openssl)"""
+    if shutil.which('openssl') is None:
+        return None
+    certfile = os.path.join(directory, 'cert.pem')
+    keyfile = os.path.join(directory, 'key.pem')
+    result = subprocess.run(
+        ['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-days', '1',
+         '-subj', '/CN=127.0.0.1', '-keyout', keyfile, '-out', certfile],
+        capture_output=True
+    )
+    return (certfile, keyfile) if result.returncode == 0 else None
+
+
+def run_child(scenario, url, wordlist):
+    """Ejecutar un escenario (en el proceso hijo) e imprimir sus métricas como JSON"""
+    from dirforcer_improved import DirForcerPro
+
+    dirforcer = DirForcerPro()
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        dirforcer.scan(url, wordlist, engine=scenario['engine'], threads=scenario['concurrency'],
+                       status_codes=[200], verify_ssl=False, timeout=scenario.get('timeout', 10),
+                       calibrate=scenario.get('calibrate', True), http2=scenario.get('http2', False),
+                       abort_after=scenario.get('abort_after', 60))
+    elapsed = time.perf_counter() - start
+
+    latency = dirforcer.stats.latency_percentiles((50, 99))
+    metrics = {
+        'requests': dirforcer.stats.completed_requests,
+        'errors': dirforcer.failed_requests - (dirforcer.total_requests - dirforcer.successful_requests),
+        'found': len(dirforcer.found_dirs),
+        'elapsed_s': round(elapsed, 3),
+        'requests_per_second': round(dirforcer.stats.completed_requests / elapsed, 1) if elapsed else 0.0,
+        'latency_p50_ms': latency['p50'],
+        'latency_p99_ms': latency['p99'],
+        'peak_rss_mb': None,
+        'cpu_time_s': None
+    }
+    if resource is not None:
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        # ru_maxrss está en KB en Linux y en bytes en macOS
+        divisor = 1024 * 1024 if sys.platform == 'darwin' else 1024
+        metrics['peak_rss_mb'] = round(usage.ru_maxrss / divisor, 1)
+        metrics['cpu_time_s'] = round(usage.ru_utime + usage.ru_stime, 3)
+    print(json.dumps(metrics))
+
+
+def run_scenario(scenario, workdir, certificate, latency):
+    """Levantar el servidor del escenario y medir el escáner en un proceso aparte"""
+    if scenario.get('tls') and certificate is None:
+        return dict(scenario, skipped='openssl no disponible para generar el certificado')
+
+    wordlist = create_wordlist(workdir, scenario['words'])
+    certfile, keyfile = certificate if scenario.get('tls') else (None, None)
+    server_class = MockH2Server if scenario.get('http2') else MockServer
+    server = server_class(EXISTING_PATHS, latency=latency, wildcard=scenario.get('wildcard', False),
+                          error_rate=scenario.get('error_rate', 0.0), drop_rate=scenario.get('drop_rate', 0.0),
+                          certfile=certfile, keyfile=keyfile, seed=0)
+    # Sin las variables de CA de requests salvo en los escenarios que comprueban que no
+    # reactivan la verificación con --no-ssl-verify
+    env = {key: value for key, value in os.environ.items()
+           if scenario.get('ca_env') or key not in ('REQUESTS_CA_BUNDLE', 'CURL_CA_BUNDLE')}
+
+    with server:
+        child = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--child', json.dumps(scenario), server.url, wordlist],
+            capture_output=True, text=True, env=env
+        )
+    if child.returncode != 0:
+        return dict(scenario, failed=child.stderr.strip().splitlines()[-1:] or ['error desconocido'])
+    result = dict(scenario, latency_server_s=latency, **json.loads(child.stdout.strip().splitlines()[-1]))
+    if result['found'] != len(EXISTING_PATHS):
+        # Un escaneo que no encuentra las rutas (p. ej. TLS fallando) no es una medida válida
+        result['failed'] = [f"encontradas {result['found']} de {len(EXISTING_PATHS)} rutas"]
+    return result
+
+
+def git_commit():
+    """Commit actual del repositorio (para identificar la ejecución)"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BENCH_DIR,
+                              capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def compare(previous_path, report):
+    """Mostrar la variación de requests/segundo respecto a una ejecución anterior"""
+    with open(previous_path, 'r', encoding='utf-8') as f:
+        previous = {result['name']: result for result in json.load(f)['results']}
+    for result in report['results']:
+        before = previous.get(result['name'], {}).get('requests_per_second')
+        after = result.get('requests_per_second')
+        if before and after:
+            change = (after - before) / before * 100
+            print(f"{result['name']:<22} {before:>10.1f} -> {after:>10.1f} req/s ({change:+.1f}%)",
+                  file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Suite de benchmarks de DirForcer Pro")
+    parser.add_argument('--suite', choices=sorted(SUITES), default='standard',
+                        help='quick (10k), standard (hasta 100k) o full (hasta 1M palabras) (default: standard)')
+    parser.add_argument('--scenarios', nargs='+', help='Ejecutar solo estos escenarios (por nombre)')
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='Latencia simulada del servidor en segundos (default: 0)')
+    parser.add_argument('-o', '--output', help='Guardar el informe JSON en este archivo')
+    parser.add_argument('--compare', help='Informe JSON anterior con el que comparar')
+    parser.add_argument('--list', action='store_true', help='Listar los escenarios y salir')
+    parser.add_argument('--child', nargs=3, metavar=('ESCENARIO', 'URL', 'WORDLIST'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(json.loads(args.child[0]), args.child[1], args.child[2])
+        return
+
+    if args.scenarios:
+        scenarios = [scenario for scenario in SCENARIOS if scenario['name'] in args.scenarios]
+    else:
+        scenarios = [scenario for scenario in SCENARIOS if scenario['words'] <= SUITES[args.suite]]
+    if args.list:
+        for scenario in scenarios:
+            print(scenario['name'])
+        return
+
+    report = {
+        'timestamp': datetime.now().isoformat(),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'results': []
+    }
+    with tempfile.TemporaryDirectory(prefix='dirforcer_bench_') as workdir:
+        certificate = create_certificate(workdir)
+        for scenario in scenarios:
+            print(f"[*] {scenario['name']}...", file=sys.stderr)
+            report['results'].append(run_scenario(scenario, workdir, certificate, args.latency))
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    print(output)
+    if args.compare:
+        compare(args.compare, report)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,7 @@ Versión: 2.0 Pro
 import os
 import sys
 import json
+import time
 import argparse
 from pathlib import Path
 
@@ -81,6 +82,41 @@ class DirForcerConfig:
         print(f"✅ Wordlist creada: {wordlist_file}")
         return wordlist_file
     
+    def compile_wordlist(self, source, output=None):
+        """Compilar una wordlist de texto al formato binario .dfw (carga instantánea con mmap)"""
+        # Importación diferida: el resto de comandos no necesitan las dependencias del escáner
+        from dirforcer_improved import CompiledWordlist
+        
+        source = Path(source)
+        output = Path(output) if output else source.with_suffix('.dfw')
+        start = time.perf_counter()
+        try:
+            count, duplicates = CompiledWordlist.compile(str(source), str(output))
+        except OSError as e:
+            print(f"❌ {e}")
+            return None
+        elapsed = time.perf_counter() - start
+        
+        print(f"✅ Wordlist compilada: {output}")
+        print(f"   - {count} entradas ({duplicates} duplicadas descartadas)")
+        print(f"   - {output.stat().st_size} bytes, {elapsed:.2f} segundos")
+        return output
+    
+    def verify_wordlist(self, path):
+        """Comprobar la integridad (checksum) de una wordlist compilada"""
+        from dirforcer_improved import CompiledWordlist
+        
+        try:
+            wordlist = CompiledWordlist(str(path))
+        except (OSError, ValueError) as e:
+            print(f"❌ {e}")
+            return False
+        if not wordlist.verify():
+            print(f"❌ Checksum incorrecto: {path}")
+            return False
+        print(f"✅ {path}: {len(wordlist)} entradas, checksum correcto")
+        return True
+    
     def create_common_wordlists(self):
         """Crear wordlists comunes predefinidas"""
         admin_words = [
@@ -182,6 +218,8 @@ Ejemplos de uso:
   python config.py --show
   python config.py --update default_threads 20
   python config.py --create-wordlists
+  python config.py --compile-wordlist big.txt -o big.dfw
+  python config.py --verify-wordlist big.dfw
         """
     )
     
@@ -193,6 +231,12 @@ Ejemplos de uso:
                        help='Actualizar un valor específico en la configuración')
     parser.add_argument('--create-wordlists', action='store_true',
                        help='Crear wordlists comunes predefinidas')
+    parser.add_argument('--compile-wordlist', metavar='WORDLIST',
+                       help='Compilar una wordlist de texto al formato binario .dfw')
+    parser.add_argument('--verify-wordlist', metavar='DFW',
+                       help='Comprobar el checksum de una wordlist compilada')
+    parser.add_argument('-o', '--output',
+                       help='Archivo de salida de --compile-wordlist (default: misma ruta con .dfw)')
     
     args = parser.parse_args()
     
@@ -217,6 +261,12 @@ Ejemplos de uso:
         config.update_config(key, value)
     elif args.create_wordlists:
         config.create_common_wordlists()
+    elif args.compile_wordlist:
+        if config.compile_wordlist(args.compile_wordlist, args.output) is None:
+            sys.exit(1)
+    elif args.verify_wordlist:
+        if not config.verify_wordlist(args.verify_wordlist):
+            sys.exit(1)
     else:
         parser.print_help()
 
@@ -8,39 +8,2221 @@ Versión: 2.0 Pro
 """
 
 import requests
+import certifi
+import asyncio
 import time
 import argparse
 import random
 import sys
 import os
 import json
+import csv
 import threading
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import mmap
+import math
+import hashlib
+import heapq
+import uuid
+import queue
+import multiprocessing
+import hmac
+import ipaddress
+import cProfile
+import struct
+import importlib.util
+from array import array
+import pstats
+import sqlite3
+from collections import deque
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
 from urllib.parse import urljoin, urlparse
 from datetime import datetime
 import logging
 from pyfiglet import Figlet
 from colorama import init, Fore, Style
 import signal
+import socket
+import ssl
+from requests.adapters import HTTPAdapter
+from requests.utils import requote_uri
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3 import disable_warnings
+from urllib3.exceptions import ConnectTimeoutError, InsecureRequestWarning
+
+# aiohttp es opcional: solo se necesita para el motor asíncrono (--engine async)
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+try:
+    import httpx
+    import httpcore
+except ImportError:
+    httpx = None
+# httpx solo negocia HTTP/2 con el paquete h2 instalado (no hace falta importarlo)
+if importlib.util.find_spec('h2') is None:
+    httpx = None
 
 # Inicializar colorama para compatibilidad cross-platform
 init(autoreset=True)
 
+DEFAULT_STATUS_CODES = [200, 301, 302, 403, 401]
+
+# Diario de checkpoint usado por --resume si no se indica --checkpoint
+DEFAULT_CHECKPOINT = 'dirforcer.checkpoint'
+
+# Estadísticas de aciertos entre escaneos (--hit-stats / --prioritize), junto a la configuración
+# de config.py; solo se leen y escriben si se piden
+DEFAULT_HIT_STATS = os.path.join(os.path.expanduser('~'), '.dirforcer', 'hits.json')
+
+# Caché de respuestas entre escaneos (--incremental): ubicación, vigencia y tamaño máximo
+DEFAULT_RESPONSE_CACHE = os.path.join(os.path.expanduser('~'), '.dirforcer', 'responses.db')
+DEFAULT_CACHE_TTL = 7 * 24 * 3600
+DEFAULT_CACHE_SIZE = 1_000_000
+
+# Cortacircuitos: errores de conexión seguidos que pausan un host y segundos caído antes de abandonarlo
+DEFAULT_BREAKER_THRESHOLD = 10
+DEFAULT_ABORT_AFTER = 300.0
+
+# Timeout de conexión máximo por defecto (el de lectura es --timeout)
+DEFAULT_CONNECT_TIMEOUT = 5.0
+
+# Cola de reintentos: intentos extra por ruta, tamaño máximo, concurrencia al vaciarla y
+# espera base antes de cada reintento (se duplica por intento, con jitter de ±50 %)
+DEFAULT_RETRIES = 2
+DEFAULT_RETRY_QUEUE_SIZE = 10_000
+DEFAULT_RETRY_CONCURRENCY = 10
+RETRY_BACKOFF = 1.0
+
+# Resultado de check_directory para una ruta que no tiene sentido reintentar (error TLS,
+# URL o cabecera inválidas): como False, la ruta no se da por comprobada
+PERMANENT_FAILURE = 'permanent-failure'
+
+# Directorios (u objetivos) recorridos a la vez; cada uno mantiene abierta la wordlist
+MAX_INTERLEAVED_DIRECTORIES = 256
+
+# Línea de estado: refresco mínimo y ventana del cálculo de requests/segundo
+STATUS_INTERVAL = 0.25
+THROUGHPUT_WINDOW = 5.0
+
+# Respuestas que indican que el objetivo pide bajar el ritmo
+OVERLOAD_STATUS_CODES = (429, 503)
+
+# Respuestas transitorias: la ruta vuelve a la cola de reintentos (salvo que sean de interés)
+RETRY_STATUS_CODES = (429, 502, 503, 504)
+
+# Códigos que indican un directorio a escanear en modo recursivo
+RECURSE_STATUS_CODES = (200, 301)
+
+# Cuerpos de respuestas descartadas por debajo de este tamaño se leen igualmente
+# en los modos head/stream para no perder la conexión keep-alive
+STREAM_DRAIN_LIMIT = 64 * 1024
+
+class Wordlist:
+    """Wordlist perezosa respaldada por mmap: las entradas se generan al iterar"""
+    
+    def __init__(self, path, dedup=False):
+        self.path = path
+        self.dedup = dedup
+        self._total = None
+    
+    def __iter__(self):
+        """Generar entradas una a una, saltando comentarios y líneas vacías"""
+        if os.path.getsize(self.path) == 0:
+            return
+        
+        # Set compacto de hashes de 8 bytes en lugar de guardar cada string
+        seen = set() if self.dedup else None
+        
+        with open(self.path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for raw in iter(mm.readline, b''):
+                if raw.startswith(b'#'):
+                    continue
+                line = raw.strip()
+                if not line:
+                    continue
+                if seen is not None:
+                    key = int.from_bytes(hashlib.blake2b(line, digest_size=8).digest(), 'little')
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                yield line.decode('utf-8', errors='replace')
+    
+    def __len__(self):
+        """Número de líneas del archivo (cota superior de entradas), contado por bloques"""
+        if self._total is None:
+            total = 0
+            last = b''
+            with open(self.path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 20), b''):
+                    total += chunk.count(b'\n')
+                    last = chunk
+            # Última línea sin salto de línea final
+            if last and not last.endswith(b'\n'):
+                total += 1
+            self._total = total
+        return self._total
+
+
+class CompiledWordlist:
+    """Wordlist precompilada (formato binario .dfw) leída con mmap
+    
+    Formato: cabecera fija, entradas UTF-8 concatenadas (ya filtradas y sin
+    duplicados) y una tabla de count + 1 offsets uint64 little-endian; la
+    entrada i es data[offsets[i]:offsets[i + 1]]. El checksum (BLAKE2b de datos
+    y tabla) solo se comprueba con verify(), así abrir la lista es inmediato.
+    """
+    
+    MAGIC = b'DFWL'
+    VERSION = 1
+    # magic, versión, reservado, entradas, tamaño de los datos, checksum
+    HEADER = struct.Struct('<4sHHQQ16s')
+    
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            header = f.read(self.HEADER.size)
+            size = os.fstat(f.fileno()).st_size
+        if len(header) < self.HEADER.size:
+            raise ValueError(f"{path} no es una wordlist compilada")
+        magic, version, _, self.count, self.data_size, self.checksum = self.HEADER.unpack(header)
+        if magic != self.MAGIC:
+            raise ValueError(f"{path} no es una wordlist compilada")
+        if version != self.VERSION:
+            raise ValueError(f"Versión de wordlist compilada no soportada: {version}")
+        if size != self.HEADER.size + self.data_size + (self.count + 1) * 8:
+            raise ValueError(f"Wordlist compilada truncada o corrupta: {path}")
+    
+    @classmethod
+    def is_compiled(cls, path):
+        """Comprobar por la firma si un archivo es una wordlist compilada"""
+        with open(path, 'rb') as f:
+            return f.read(len(cls.MAGIC)) == cls.MAGIC
+    
+    def __len__(self):
+        return self.count
+    
+    def __iter__(self):
+        return self.entries()
+    
+    def entries(self, start=0, step=1):
+        """Entradas start, start + step, ...: se decodifican directamente desde el mmap"""
+        if self.count == 0:
+            return
+        with open(self.path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            view = memoryview(mm)
+            offsets = view[self.HEADER.size + self.data_size:].cast('Q')
+            if sys.byteorder != 'little':
+                offsets = array('Q', offsets)
+                offsets.byteswap()
+            data = view[self.HEADER.size:self.HEADER.size + self.data_size]
+            try:
+                for i in range(start, self.count, step):
+                    yield str(data[offsets[i]:offsets[i + 1]], 'utf-8', 'replace')
+            finally:
+                # Liberar las vistas antes de que se cierre el mmap
+                if isinstance(offsets, memoryview):
+                    offsets.release()
+                data.release()
+                view.release()
+    
+    def verify(self):
+        """Recalcular el checksum de datos y tabla de offsets"""
+        digest = hashlib.blake2b(digest_size=16)
+        with open(self.path, 'rb') as f:
+            f.seek(self.HEADER.size)
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        return digest.digest() == self.checksum
+    
+    @classmethod
+    def compile(cls, source, output):
+        """Compilar una wordlist de texto; devuelve (entradas, duplicadas descartadas)"""
+        offsets = array('Q', [0])
+        digest = hashlib.blake2b(digest_size=16)
+        seen = set()
+        duplicates = 0
+        position = 0
+        tmp_path = f"{output}.tmp"
+        try:
+            with open(tmp_path, 'wb') as out:
+                out.write(b'\0' * cls.HEADER.size)
+                # Mismo filtrado que Wordlist; duplicados por hash de 8 bytes, como --dedup
+                for entry in Wordlist(source):
+                    encoded = entry.encode('utf-8')
+                    key = int.from_bytes(hashlib.blake2b(encoded, digest_size=8).digest(), 'little')
+                    if key in seen:
+                        duplicates += 1
+                        continue
+                    seen.add(key)
+                    out.write(encoded)
+                    digest.update(encoded)
+                    position += len(encoded)
+                    offsets.append(position)
+                
+                if sys.byteorder != 'little':
+                    offsets.byteswap()
+                table = offsets.tobytes()
+                out.write(table)
+                digest.update(table)
+                out.seek(0)
+                out.write(cls.HEADER.pack(cls.MAGIC, cls.VERSION, 0, len(offsets) - 1, position,
+                                          digest.digest()))
+            os.replace(tmp_path, output)
+        except BaseException:
+            # Sin dejar un .tmp a medias (origen inexistente, disco lleno, Ctrl+C)
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return len(offsets) - 1, duplicates
+
+
+class PrioritizedWordlist:
+    """Wordlist con las entradas de más aciertos históricos primero (--prioritize)
+    
+    El orden se fija al crearla (y se guarda en el checkpoint): primero
+    `priority`, luego el resto de la wordlist en su orden original.
+    """
+    
+    def __init__(self, wordlist, priority):
+        self.wordlist = wordlist
+        self.priority = list(priority)
+    
+    def __iter__(self):
+        yield from self.priority
+        skip = set(self.priority)
+        for word in self.wordlist:
+            if word not in skip:
+                yield word
+    
+    def __len__(self):
+        return len(self.wordlist)
+
+
+class HitStatistics:
+    """Almacén local (JSON) de cuántas veces ha dado resultado cada entrada de la wordlist"""
+    
+    def __init__(self, path=DEFAULT_HIT_STATS):
+        self.path = path
+        self.hits = {}
+        self.scans = 0
+        self.changed = False
+    
+    def load(self):
+        """Cargar el almacén; si no existe o está corrupto se empieza de cero"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.hits = {str(word): int(count) for word, count in data.get('hits', {}).items()}
+            self.scans = int(data.get('scans', 0))
+        except FileNotFoundError:
+            pass
+        except (ValueError, AttributeError, TypeError):
+            logging.getLogger(__name__).warning(f"Estadísticas de aciertos corruptas, se ignoran: {self.path}")
+        return self
+    
+    def record(self, directory):
+        """Contar un acierto de una entrada"""
+        word = directory.strip('/')
+        if word:
+            self.hits[word] = self.hits.get(word, 0) + 1
+            self.changed = True
+    
+    def rank(self, wordlist):
+        """Entradas de la wordlist con aciertos previos, de más a menos frecuentes"""
+        if not self.hits:
+            return []
+        present = {word for word in wordlist if word in self.hits}
+        return sorted(present, key=lambda word: (-self.hits[word], word))
+    
+    def save(self):
+        """Guardar el almacén de forma atómica (un escaneo interrumpido no lo corrompe)"""
+        self.scans += 1
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': 1, 'scans': self.scans, 'hits': self.hits}, f)
+        os.replace(tmp_path, self.path)
+        self.changed = False
+
+
+class ResponseCache:
+    """Caché en disco (SQLite) de respuestas entre escaneos, por (origen, ruta)
+    
+    Guarda código de estado, tamaño y validadores (ETag / Last-Modified) de cada
+    ruta sondeada. Las entradas caducan a los `ttl` segundos de su última
+    comprobación y, por encima de `max_entries`, se descartan las usadas hace más
+    tiempo (LRU). Las escrituras se agrupan en lotes para no pagar un commit por request;
+    las lecturas usan una conexión por thread y no esperan al lock de escritura.
+    """
+    
+    FLUSH_EVERY = 1000
+    
+    def __init__(self, path=DEFAULT_RESPONSE_CACHE, ttl=DEFAULT_CACHE_TTL, max_entries=DEFAULT_CACHE_SIZE):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.connection = None
+        self.lock = threading.Lock()
+        self.pending = []
+        self.touched = []
+        # Conexiones de solo lectura, una por thread (WAL admite lectores concurrentes)
+        self.local = threading.local()
+        self.readers = []
+    
+    def open(self):
+        """Abrir (o crear) la base de datos y purgar las entradas caducadas"""
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        # La conexión de escritura la comparten los threads, protegida por self.lock;
+        # con --processes cada proceso abre la suya y SQLite serializa las escrituras
+        self.connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            'origin TEXT NOT NULL, path TEXT NOT NULL, status INTEGER NOT NULL, '
+            'length INTEGER NOT NULL, etag TEXT, last_modified TEXT, found INTEGER NOT NULL, '
+            'filtered INTEGER NOT NULL, checked REAL NOT NULL, used REAL NOT NULL, '
+            'PRIMARY KEY (origin, path)) WITHOUT ROWID'
+        )
+        self.connection.execute('CREATE INDEX IF NOT EXISTS responses_used ON responses (used)')
+        with self.connection:
+            self.connection.execute('DELETE FROM responses WHERE checked < ?', (time.time() - self.ttl,))
+        return self
+    
+    @staticmethod
+    def key(url):
+        """Clave (origen, ruta) de una URL"""
+        parsed = urlparse(url)
+        path = parsed.path or '/'
+        if parsed.query:
+            path = f"{path}?{parsed.query}"
+        return f"{parsed.scheme}://{parsed.netloc}", path
+    
+    def reader(self):
+        """Conexión de lectura del thread actual (se abre la primera vez)"""
+        connection = getattr(self.local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            self.local.connection = connection
+            with self.lock:
+                self.readers.append(connection)
+        return connection
+    
+    def get(self, url):
+        """Entrada vigente de una URL (dict), o None si no está o ha caducado"""
+        origin, path = self.key(url)
+        row = self.reader().execute(
+            'SELECT status, length, etag, last_modified, found, filtered, checked '
+            'FROM responses WHERE origin = ? AND path = ?', (origin, path)
+        ).fetchone()
+        if row is None or row[6] < time.time() - self.ttl:
+            return None
+        with self.lock:
+            self.touched.append((time.time(), origin, path))
+            # Un reescaneo con todo en caché solo genera accesos: también hay que volcarlos
+            if len(self.pending) + len(self.touched) >= self.FLUSH_EVERY:
+                self._flush()
+        return {'status': row[0], 'length': row[1], 'etag': row[2], 'last_modified': row[3],
+                'found': bool(row[4]), 'filtered': bool(row[5]), 'checked': row[6]}
+    
+    @staticmethod
+    def conditional_headers(entry):
+        """Cabeceras para revalidar una entrada (If-None-Match / If-Modified-Since)"""
+        headers = {}
+        if entry is not None and entry['found']:
+            if entry['etag']:
+                headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers or None
+    
+    def store(self, url, status, length, headers=None, found=False, filtered=False):
+        """Guardar (en el siguiente lote) la respuesta de una URL"""
+        origin, path = self.key(url)
+        etag = last_modified = None
+        if headers is not None:
+            etag = headers.get('ETag')
+            last_modified = headers.get('Last-Modified')
+        now = time.time()
+        with self.lock:
+            self.pending.append((origin, path, status, length, etag, last_modified,
+                                 int(found), int(filtered), now, now))
+            if len(self.pending) + len(self.touched) >= self.FLUSH_EVERY:
+                self._flush()
+    
+    def _flush(self):
+        if not self.pending and not self.touched:
+            return
+        with self.connection:
+            self.connection.executemany(
+                'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', self.pending
+            )
+            self.connection.executemany(
+                'UPDATE responses SET used = ? WHERE origin = ? AND path = ?', self.touched
+            )
+        self.pending = []
+        self.touched = []
+        self._trim()
+    
+    def _trim(self):
+        """Descartar las entradas usadas hace más tiempo por encima de max_entries (LRU)"""
+        count = self.connection.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+        if count > self.max_entries:
+            with self.connection:
+                self.connection.execute(
+                    'DELETE FROM responses WHERE (origin, path) IN '
+                    '(SELECT origin, path FROM responses ORDER BY used LIMIT ?)',
+                    (count - self.max_entries,)
+                )
+    
+    def close(self):
+        """Escribir lo pendiente, aplicar el límite de tamaño (LRU) y cerrar"""
+        if self.connection is None:
+            return
+        with self.lock:
+            self._flush()
+            self._trim()
+            for reader in self.readers:
+                reader.close()
+            self.readers = []
+            self.local = threading.local()
+            self.connection.close()
+            self.connection = None
+    
+    def __len__(self):
+        with self.lock:
+            return self.connection.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+
+
+class WordlistExpansion:
+    """Expansión perezosa de la wordlist: extensiones, plantillas y mutaciones por entrada
+    
+    Las variantes de cada entrada se generan al iterar, nunca se guardan; la
+    expansión es determinista, así que los offsets sirven para el checkpoint.
+    """
+    
+    # La primera variante es siempre la entrada tal cual
+    CASE_VARIANTS = (str, str.lower, str.upper, str.capitalize)
+    BACKUP_PATTERNS = ('{entry}~', '{entry}.bak', '{entry}.old', '.{entry}.swp')
+    BACKUP_SUFFIXES = ('~', '.bak', '.old', '.swp')
+    MUTATIONS = ('case', 'backup')
+    
+    def __init__(self, wordlist, extensions=(), patterns=None, mutations=()):
+        self.wordlist = wordlist
+        self.extensions = [ext.strip().lstrip('.') for ext in extensions if ext.strip()]
+        self.patterns = list(patterns or (['{word}', '{word}.{ext}'] if self.extensions else ['{word}']))
+        self.mutations = sorted(set(mutations))
+        self.cases = self.CASE_VARIANTS if 'case' in self.mutations else self.CASE_VARIANTS[:1]
+        self.backups = self.BACKUP_PATTERNS if 'backup' in self.mutations else ()
+        
+        # Plantillas concretas: las que usan {ext} se repiten para cada extensión
+        self.templates = []
+        for pattern in self.patterns:
+            if '{ext}' in pattern:
+                self.templates.extend(pattern.replace('{ext}', ext) for ext in self.extensions)
+            else:
+                self.templates.append(pattern)
+        self.per_word = len(self.cases) * len(self.templates) * (1 + len(self.backups))
+    
+    def __iter__(self):
+        for _, entry in self.variants():
+            yield entry
+    
+    def variants(self):
+        """Pares (entrada de la wordlist, variante) en el orden de iteración"""
+        for word in self.wordlist:
+            # Las variantes repetidas (p. ej. 'admin' en minúsculas) se envían una sola vez
+            seen = set()
+            for entry in self.expand(word):
+                if entry not in seen:
+                    seen.add(entry)
+                    yield word, entry
+    
+    def __len__(self):
+        """Cota superior calculada sin expandir: entradas × variantes por entrada"""
+        return len(self.wordlist) * self.per_word
+    
+    def expand(self, word):
+        """Variantes de una entrada de la wordlist"""
+        for case in self.cases:
+            cased = case(word)
+            for template in self.templates:
+                entry = template.replace('{word}', cased)
+                yield entry
+                # Las copias de seguridad solo tienen sentido para archivos (y no de otra copia)
+                if self.backups and '.' in entry.rsplit('/', 1)[-1] and not entry.endswith(self.BACKUP_SUFFIXES):
+                    for backup in self.backups:
+                        yield backup.replace('{entry}', entry)
+    
+    def config(self):
+        """Parámetros de la expansión (para el checkpoint y los procesos worker)"""
+        return {'extensions': self.extensions, 'patterns': self.patterns, 'mutations': self.mutations}
+
+
+class LatencyHistogram:
+    """Histograma de latencias con buckets logarítmicos de memoria fija"""
+    
+    MIN_MS = 0.1
+    GROWTH = 1.05
+    BUCKETS = 280  # cubre de 0.1 ms a ~80 s con un error máximo del 5%
+    
+    def __init__(self):
+        self.counts = [0] * self.BUCKETS
+    
+    def record(self, latency_ms):
+        """Registrar una latencia en milisegundos"""
+        if latency_ms <= self.MIN_MS:
+            index = 0
+        else:
+            index = min(int(math.log(latency_ms / self.MIN_MS, self.GROWTH)), self.BUCKETS - 1)
+        self.counts[index] += 1
+    
+    def merge(self, other):
+        """Acumular los buckets de otro histograma"""
+        for i, count in enumerate(other.counts):
+            if count:
+                self.counts[i] += count
+    
+    def upper_bound(self, index):
+        """Límite superior (ms) de un bucket"""
+        return self.MIN_MS * self.GROWTH ** (index + 1)
+    
+    def to_dict(self):
+        """Representación JSON: solo los buckets con muestras, como [límite superior ms, cuenta]"""
+        return {
+            'min_ms': self.MIN_MS,
+            'growth': self.GROWTH,
+            'count': sum(self.counts),
+            'percentiles_ms': {f"p{pct}": round(self.percentile(pct), 2) for pct in (50, 90, 99, 99.9)},
+            'buckets': [[round(self.upper_bound(i), 3), count] for i, count in enumerate(self.counts) if count]
+        }
+    
+    def percentile(self, pct):
+        """Latencia (límite superior del bucket) del percentil indicado"""
+        total = sum(self.counts)
+        if total == 0:
+            return 0.0
+        threshold = max(1, math.ceil(total * pct / 100))
+        cumulative = 0
+        for i, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= threshold:
+                return self.upper_bound(i)
+        return self.MIN_MS * self.GROWTH ** self.BUCKETS
+
+
+class WorkerStats:
+    """Contadores de un único worker: solo los modifica su propio thread"""
+    
+    __slots__ = ('started', 'finished', 'successful', 'misses', 'errors', 'server_errors', 'filtered',
+                 'cached', 'revalidated', 'retried', 'results', 'histogram')
+    
+    # Contadores que viajan en las instantáneas entre procesos
+    COUNTERS = ('started', 'finished', 'successful', 'misses', 'errors', 'server_errors', 'filtered',
+                'cached', 'revalidated', 'retried')
+    
+    def __init__(self):
+        self.started = 0
+        self.finished = 0
+        self.successful = 0
+        self.misses = 0
+        self.errors = 0
+        self.server_errors = 0
+        self.filtered = 0
+        self.cached = 0
+        self.revalidated = 0
+        self.retried = 0
+        self.results = []
+        self.histogram = LatencyHistogram()
+    
+    def load(self, snapshot):
+        """Sustituir los contadores por los de una instantánea (ScanStats.snapshot)"""
+        for field in self.COUNTERS:
+            setattr(self, field, snapshot[field])
+        self.histogram.counts = list(snapshot['histogram'])
+    
+    def add(self, snapshot):
+        """Acumular los contadores de una instantánea parcial (un chunk distribuido)"""
+        for field in self.COUNTERS:
+            setattr(self, field, getattr(self, field) + snapshot.get(field, 0))
+        for i, count in enumerate(snapshot.get('histogram', [])[:len(self.histogram.counts)]):
+            if count:
+                self.histogram.counts[i] += count
+
+
+class ScanStats:
+    """Métricas del escaneo sin lock global: contadores por worker que se suman al leer"""
+    
+    def __init__(self):
+        self._local = threading.local()
+        self._workers = []
+        self._register_lock = threading.Lock()
+        # Con salida en streaming los resultados no se acumulan en memoria
+        self.keep_results = True
+    
+    def worker(self):
+        """Contadores del thread actual (se registran la primera vez)"""
+        slot = getattr(self._local, 'slot', None)
+        if slot is None:
+            slot = WorkerStats()
+            # El lock solo se toma una vez por thread, nunca en el camino caliente
+            with self._register_lock:
+                self._workers.append(slot)
+            self._local.slot = slot
+        return slot
+    
+    def remote_worker(self):
+        """Registrar contadores alimentados desde otro proceso (--processes)"""
+        slot = WorkerStats()
+        with self._register_lock:
+            self._workers.append(slot)
+        return slot
+    
+    def snapshot(self):
+        """Contadores acumulados de todos los workers, serializables entre procesos"""
+        snapshot = {field: self._sum(field) for field in WorkerStats.COUNTERS}
+        snapshot['histogram'] = self.histogram().counts
+        return snapshot
+    
+    def request_started(self):
+        """Marcar el inicio de un request y devolver su instante de inicio"""
+        self.worker().started += 1
+        return time.perf_counter()
+    
+    def request_finished(self, started_at):
+        """Marcar el fin de un request, registrar su latencia y devolverla en segundos"""
+        slot = self.worker()
+        slot.finished += 1
+        latency = time.perf_counter() - started_at
+        slot.histogram.record(latency * 1000)
+        return latency
+    
+    def record_response(self, success):
+        """Contabilizar una respuesta recibida"""
+        slot = self.worker()
+        if success:
+            slot.successful += 1
+        else:
+            slot.misses += 1
+    
+    def record_filtered(self):
+        """Contabilizar una respuesta descartada por el filtro de wildcard"""
+        slot = self.worker()
+        slot.misses += 1
+        slot.filtered += 1
+    
+    def record_cached(self):
+        """Contabilizar una ruta resuelta con la caché de respuestas, sin enviar el request"""
+        slot = self.worker()
+        # Cuenta como trabajo completado (progreso) pero no como request ni en las latencias
+        slot.started += 1
+        slot.finished += 1
+        slot.cached += 1
+    
+    def record_revalidated(self):
+        """Contabilizar una respuesta 304 a un request condicional"""
+        self.worker().revalidated += 1
+    
+    def record_retry(self):
+        """Contabilizar una ruta fallida que vuelve a la cola de reintentos"""
+        self.worker().retried += 1
+    
+    def record_error(self):
+        """Contabilizar un request que terminó en error de conexión"""
+        self.worker().errors += 1
+    
+    def record_server_error(self):
+        """Contabilizar una respuesta 5xx (además de su registro como respuesta)"""
+        self.worker().server_errors += 1
+    
+    def add_result(self, result):
+        """Guardar un resultado encontrado"""
+        if self.keep_results:
+            self.worker().results.append(result)
+    
+    def _sum(self, field):
+        return sum(getattr(slot, field) for slot in list(self._workers))
+    
+    @property
+    def total_requests(self):
+        return self._sum('successful') + self._sum('misses')
+    
+    @property
+    def successful_requests(self):
+        return self._sum('successful')
+    
+    @property
+    def failed_requests(self):
+        return self._sum('misses') + self._sum('errors')
+    
+    @property
+    def filtered_requests(self):
+        return self._sum('filtered')
+    
+    @property
+    def cached_requests(self):
+        return self._sum('cached')
+    
+    @property
+    def revalidated_requests(self):
+        return self._sum('revalidated')
+    
+    @property
+    def retried_requests(self):
+        return self._sum('retried')
+    
+    @property
+    def completed_requests(self):
+        return self._sum('finished')
+    
+    @property
+    def error_requests(self):
+        """Errores de conexión más respuestas 5xx"""
+        return self._sum('errors') + self._sum('server_errors')
+    
+    @property
+    def in_flight(self):
+        return self._sum('started') - self._sum('finished')
+    
+    @property
+    def results(self):
+        merged = []
+        for slot in list(self._workers):
+            merged.extend(slot.results)
+        return merged
+    
+    def histogram(self):
+        """Histograma de latencias combinado de todos los workers"""
+        merged = LatencyHistogram()
+        for slot in list(self._workers):
+            merged.merge(slot.histogram)
+        return merged
+    
+    def requests_per_second(self, elapsed):
+        """Requests completados por segundo"""
+        if elapsed <= 0:
+            return 0.0
+        # Las rutas resueltas con la caché de respuestas (--incremental) no son requests
+        return (self._sum('finished') - self._sum('cached')) / elapsed
+    
+    def latency_percentiles(self, percentiles=(50, 90, 99)):
+        """Percentiles de latencia en milisegundos"""
+        histogram = self.histogram()
+        return {f"p{pct}": round(histogram.percentile(pct), 2) for pct in percentiles}
+
+
+class ScanFrontier:
+    """Frontera de escaneo: directorios pendientes ordenados por profundidad (BFS)"""
+    
+    def __init__(self, wordlist, max_depth=0, interleave=1, per_host_limit=None, shard=None):
+        self.wordlist = wordlist
+        self.max_depth = max_depth
+        self.heap = []
+        self.visited = set()
+        self.counter = 0
+        # Directorios que se recorren a la vez, alternando entre ellos (round-robin)
+        self.interleave = max(1, interleave)
+        self.active = []
+        self.position = 0
+        # Límite de requests en vuelo por host
+        self.per_host_limit = per_host_limit
+        self.host_in_flight = {}
+        # (índice, total): con --processes cada proceso recorre offset % total == índice
+        self.shard = shard
+        # Progreso restaurado de un checkpoint: base_url -> (offset, offsets ya hechos)
+        self.resume_state = {}
+        # Presupuesto de requests de esta ejecución (--max-requests)
+        self.max_jobs = None
+        self.issued = 0
+        # Cola de reintentos: heap de (no antes de, orden, trabajo) con los trabajos fallidos
+        # por errores transitorios; se vacía al agotar la wordlist
+        self.retries = []
+        self.attempts = {}
+        self.retrying = set()
+        self.max_retries = DEFAULT_RETRIES
+        self.retry_limit = DEFAULT_RETRY_QUEUE_SIZE
+        self.retry_concurrency = DEFAULT_RETRY_CONCURRENCY
+        self.retried = 0
+    
+    def add(self, base_url, depth):
+        """Encolar un directorio si no se ha visitado y no supera la profundidad máxima"""
+        base_url = base_url.rstrip('/')
+        if depth > self.max_depth or base_url in self.visited:
+            return False
+        self.visited.add(base_url)
+        self.counter += 1
+        heapq.heappush(self.heap, (depth, self.counter, base_url))
+        return True
+    
+    def next_job(self):
+        """Siguiente (base_url, entrada, profundidad, offset, palabra), o None si ahora mismo no hay trabajo"""
+        if self.max_jobs is not None and self.issued >= self.max_jobs:
+            return None
+        while self.heap and len(self.active) < self.interleave:
+            depth, _, base_url = heapq.heappop(self.heap)
+            host = urlparse(base_url).netloc
+            self.active.append([base_url, depth, host, self.iter_entries(base_url)])
+        
+        checked = 0
+        while self.active and checked < len(self.active):
+            self.position %= len(self.active)
+            base_url, depth, host, entries = self.active[self.position]
+            
+            # Host saturado: probar con el siguiente directorio activo
+            if self.per_host_limit and self.host_in_flight.get(host, 0) >= self.per_host_limit:
+                self.position += 1
+                checked += 1
+                continue
+            
+            for offset, directory, word in entries:
+                self.host_in_flight[host] = self.host_in_flight.get(host, 0) + 1
+                self.position += 1
+                self.issued += 1
+                return base_url, directory, depth, offset, word
+            
+            # Wordlist agotada para este directorio: dar paso al siguiente de la frontera
+            self.active.pop(self.position)
+            if self.heap:
+                depth, _, base_url = heapq.heappop(self.heap)
+                self.active.append([base_url, depth, urlparse(base_url).netloc,
+                                    self.iter_entries(base_url)])
+        if not self.active:
+            return self.next_retry()
+        return None
+    
+    def next_retry(self):
+        """Siguiente reintento cuya espera haya pasado y cuyo host tenga hueco, o None"""
+        if len(self.retrying) >= self.retry_concurrency:
+            return None
+        now = time.monotonic()
+        job = None
+        saturated = []
+        while self.retries and self.retries[0][0] <= now:
+            entry = heapq.heappop(self.retries)
+            host = urlparse(entry[2][0]).netloc
+            if self.per_host_limit and self.host_in_flight.get(host, 0) >= self.per_host_limit:
+                saturated.append(entry)
+                continue
+            job = entry[2]
+            break
+        for entry in saturated:
+            heapq.heappush(self.retries, entry)
+        if job is None:
+            return None
+        host = urlparse(job[0]).netloc
+        self.host_in_flight[host] = self.host_in_flight.get(host, 0) + 1
+        self.issued += 1
+        self.retrying.add(job)
+        return job
+    
+    def retry_delay(self):
+        """Segundos hasta el próximo reintento si solo queda esperar a que llegue su hora, o None"""
+        if self.active or self.heap or not self.retries:
+            return None
+        if self.max_jobs is not None and self.issued >= self.max_jobs:
+            return None
+        delay = self.retries[0][0] - time.monotonic()
+        return delay if delay > 0 else None
+    
+    def retry(self, job):
+        """Encolar de nuevo un trabajo fallido; False si agotó sus reintentos o la cola está llena"""
+        attempts = self.attempts.get(job, 0)
+        if attempts >= self.max_retries or len(self.retries) >= self.retry_limit:
+            self.attempts.pop(job, None)
+            return False
+        self.attempts[job] = attempts + 1
+        self.retried += 1
+        heapq.heappush(self.retries, (time.monotonic() + self.retry_backoff(attempts), self.retried, job))
+        return True
+    
+    @staticmethod
+    def retry_backoff(attempts):
+        """Backoff exponencial con jitter: los reintentos no llegan todos a la vez"""
+        return RETRY_BACKOFF * 2 ** attempts * random.uniform(0.5, 1.5)
+    
+    def job_done(self, job):
+        """Liberar el hueco del host de un trabajo terminado o cancelado"""
+        host = urlparse(job[0]).netloc
+        self.host_in_flight[host] -= 1
+        self.retrying.discard(job)
+    
+    def iter_entries(self, base_url):
+        """Entradas de la wordlist con su offset y la palabra de la que salen, saltando las ya completadas"""
+        done_offset, done_extra = self.resume_state.get(base_url, (0, ()))
+        shard_index, shard_count = self.shard or (0, 1)
+        if isinstance(self.wordlist, CompiledWordlist):
+            # Acceso por offset: lo ya completado y lo de otros procesos no se lee
+            start = done_offset + (shard_index - done_offset) % shard_count
+            for offset, directory in zip(range(start, len(self.wordlist), shard_count),
+                                         self.wordlist.entries(start, shard_count)):
+                if offset not in done_extra:
+                    yield offset, directory, directory
+            return
+        # Con expansión, las estadísticas de aciertos se llevan por la palabra original
+        if isinstance(self.wordlist, WordlistExpansion):
+            variants = self.wordlist.variants()
+        else:
+            variants = ((directory, directory) for directory in self.wordlist)
+        for offset, (word, directory) in enumerate(variants):
+            if offset < done_offset or offset in done_extra or offset % shard_count != shard_index:
+                continue
+            yield offset, directory, word
+    
+    @property
+    def total_jobs(self):
+        """Trabajos conocidos hasta ahora: wordlist por cada directorio encolado"""
+        total = len(self.wordlist) * len(self.visited) + self.retried
+        return total if self.max_jobs is None else min(total, self.max_jobs)
+
+
+class ChunkFrontier:
+    """Frontera de un worker distribuido: la lista fija de trabajos de un chunk"""
+    
+    max_depth = 0
+    
+    def __init__(self, jobs):
+        self.jobs = deque(jobs)
+        self.total_jobs = len(self.jobs)
+        # Reintentos con el mismo backoff que ScanFrontier: heap de (no antes de, orden, trabajo)
+        self.retries = []
+        self.retried = 0
+        self.attempts = {}
+        self.max_retries = DEFAULT_RETRIES
+    
+    def add(self, base_url, depth):
+        """La recursión la decide el coordinador, no el worker"""
+        return False
+    
+    def next_job(self):
+        if self.jobs:
+            return self.jobs.popleft()
+        if self.retries and self.retries[0][0] <= time.monotonic():
+            return heapq.heappop(self.retries)[2]
+        return None
+    
+    def retry(self, job):
+        """Reintentar al final del chunk un trabajo fallido; False si ya agotó sus reintentos"""
+        attempts = self.attempts.get(job, 0)
+        if attempts >= self.max_retries:
+            self.attempts.pop(job, None)
+            return False
+        self.attempts[job] = attempts + 1
+        self.retried += 1
+        heapq.heappush(self.retries,
+                       (time.monotonic() + ScanFrontier.retry_backoff(attempts), self.retried, job))
+        self.total_jobs += 1
+        return True
+    
+    def retry_delay(self):
+        """Segundos hasta el próximo reintento si solo queda esperar a que llegue su hora, o None"""
+        if self.jobs or not self.retries:
+            return None
+        delay = self.retries[0][0] - time.monotonic()
+        return delay if delay > 0 else None
+    
+    def job_done(self, job):
+        pass
+
+
+class CheckpointJournal:
+    """Diario de checkpoint en modo append (JSON Lines) para reanudar escaneos interrumpidos"""
+    
+    def __init__(self, path, flush_every=500, flush_interval=5.0):
+        self.path = path
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.file = None
+        self.buffer = []
+        self.completed_since_flush = 0
+        self.last_flush = time.monotonic()
+        # base_url -> [offset contiguo completado, set de offsets completados por encima]
+        self.progress = {}
+        self.dirty = set()
+        # Bytes del diario cargado hasta su última línea completa
+        self.complete_size = None
+    
+    def load(self):
+        """Leer un diario existente: cabecera, directorios, progreso y resultados"""
+        state = {'header': None, 'directories': [], 'progress': {}, 'results': []}
+        size = self.complete_size = 0
+        with open(self.path, 'rb') as f:
+            for line in f:
+                size += len(line)
+                try:
+                    record = json.loads(line)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    # Última línea a medio escribir tras un corte
+                    if line.endswith(b'\n'):
+                        self.complete_size = size
+                    continue
+                self.complete_size = size
+                kind = record.get('type')
+                if kind == 'header':
+                    state['header'] = record
+                elif kind == 'directory':
+                    state['directories'].append((record['base'], record['depth']))
+                elif kind == 'progress':
+                    state['progress'][record['base']] = (record['offset'], set(record['extra']))
+                elif kind == 'result':
+                    state['results'].append(record['result'])
+        
+        for base_url, (offset, extra) in state['progress'].items():
+            self.progress[base_url] = [offset, set(extra)]
+        return state
+    
+    def open(self, header=None):
+        """Abrir el diario para añadir registros"""
+        if self.complete_size is not None:
+            # Descartar la línea cortada: el siguiente registro se pegaría a ella
+            with open(self.path, 'r+b') as f:
+                f.truncate(self.complete_size)
+                if self.complete_size:
+                    f.seek(self.complete_size - 1)
+                    if f.read(1) != b'\n':
+                        # Registro completo al que solo le faltaba el salto de línea
+                        f.write(b'\n')
+        self.file = open(self.path, 'a', encoding='utf-8')
+        if header is not None:
+            self.write({'type': 'header', **header})
+    
+    def write(self, record):
+        self.buffer.append(json.dumps(record, ensure_ascii=False))
+    
+    def record_directory(self, base_url, depth):
+        """Registrar un directorio añadido a la frontera"""
+        self.write({'type': 'directory', 'base': base_url, 'depth': depth})
+    
+    def record_result(self, result):
+        """Registrar un hallazgo"""
+        self.write({'type': 'result', 'result': result})
+    
+    def record_completed(self, base_url, offset):
+        """Marcar un offset de la wordlist como completado para un directorio"""
+        progress = self.progress.setdefault(base_url, [0, set()])
+        if offset == progress[0]:
+            progress[0] += 1
+            extra = progress[1]
+            while progress[0] in extra:
+                extra.discard(progress[0])
+                progress[0] += 1
+        elif offset > progress[0]:
+            progress[1].add(offset)
+        self.dirty.add(base_url)
+        
+        self.completed_since_flush += 1
+        if (self.completed_since_flush >= self.flush_every
+                or time.monotonic() - self.last_flush >= self.flush_interval):
+            self.flush()
+    
+    def flush(self):
+        """Escribir al disco los registros acumulados en un único bloque"""
+        if self.file is None:
+            return
+        for base_url in self.dirty:
+            offset, extra = self.progress[base_url]
+            self.write({'type': 'progress', 'base': base_url, 'offset': offset, 'extra': sorted(extra)})
+        self.dirty.clear()
+        if self.buffer:
+            self.file.write('\n'.join(self.buffer) + '\n')
+            self.file.flush()
+            self.buffer = []
+        self.completed_since_flush = 0
+        self.last_flush = time.monotonic()
+    
+    def close(self):
+        """Volcar lo pendiente y cerrar el diario"""
+        if self.file is not None:
+            self.flush()
+            self.file.close()
+            self.file = None
+
+
+class WildcardFilter:
+    """Huellas de las respuestas a rutas inexistentes (wildcard / soft-404)"""
+    
+    LENGTH_BUCKET = 16
+    
+    def __init__(self):
+        self.statuses = set()
+        self.body_hashes = set()
+        self.shapes = set()
+    
+    def fingerprint(self, status_code, body, path):
+        """Calcular (hash del cuerpo, forma) eliminando la ruta reflejada en el cuerpo"""
+        path = path.strip('/')
+        if path:
+            # La ruta puede aparecer completa o solo su último segmento, tal cual o
+            # codificada como en la URL; primero las variantes más largas
+            name = path.rsplit('/', 1)[-1]
+            for variant in sorted({path, requote_uri(path), name, requote_uri(name)}, key=len, reverse=True):
+                body = body.replace(variant.encode('utf-8', errors='replace'), b'')
+        body_hash = hashlib.blake2b(body, digest_size=8).digest()
+        shape = (status_code, len(body) // self.LENGTH_BUCKET, len(body.split()))
+        return (status_code, body_hash), shape
+    
+    def add(self, status_code, body, path):
+        """Añadir la huella de una respuesta de referencia"""
+        body_hash, shape = self.fingerprint(status_code, body, path)
+        self.statuses.add(status_code)
+        self.body_hashes.add(body_hash)
+        self.shapes.add(shape)
+    
+    def matches(self, status_code, body, path):
+        """Comprobar en O(1) si una respuesta coincide con la huella de referencia"""
+        if status_code not in self.statuses:
+            return False
+        body_hash, shape = self.fingerprint(status_code, body, path)
+        return body_hash in self.body_hashes or shape in self.shapes
+    
+    def to_dict(self):
+        """Representación JSON (para enviar la huella a los workers distribuidos)"""
+        return {
+            'statuses': sorted(self.statuses),
+            'body_hashes': [[status, digest.hex()] for status, digest in self.body_hashes],
+            'shapes': [list(shape) for shape in self.shapes]
+        }
+    
+    @classmethod
+    def from_dict(cls, data):
+        """Reconstruir una huella creada con to_dict"""
+        wildcard = cls()
+        wildcard.statuses = set(data['statuses'])
+        wildcard.body_hashes = {(status, bytes.fromhex(digest)) for status, digest in data['body_hashes']}
+        wildcard.shapes = {tuple(shape) for shape in data['shapes']}
+        return wildcard
+
+
+class RateLimiter:
+    """Token bucket global con control adaptativo AIMD opcional"""
+    
+    def __init__(self, rate, burst=None, adaptive=False, min_rate=1.0, max_rate=10000.0):
+        self.rate = float(rate)
+        # Ráfaga de ~100 ms de tráfico como máximo
+        self.burst = burst or max(1.0, self.rate / 10)
+        self.tokens = self.burst
+        self.adaptive = adaptive
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.last_refill = time.monotonic()
+        self.last_decrease = 0.0
+        self.latency_ewma = None
+        self.latency_floor = None
+        self.lock = threading.Lock()
+    
+    def reserve(self):
+        """Reservar un token y devolver cuántos segundos hay que esperar para usarlo"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.last_refill) * self.rate)
+            self.last_refill = now
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+    
+    def acquire(self):
+        """Esperar (bloqueando el thread) hasta disponer de un token"""
+        wait_time = self.reserve()
+        if wait_time > 0:
+            time.sleep(wait_time)
+    
+    async def acquire_async(self):
+        """Esperar (sin bloquear el event loop) hasta disponer de un token"""
+        wait_time = self.reserve()
+        if wait_time > 0:
+            await asyncio.sleep(wait_time)
+    
+    def on_complete(self, latency):
+        """Incremento aditivo: ~+1 req/s por segundo mientras el objetivo responde bien"""
+        if not self.adaptive:
+            return
+        with self.lock:
+            self.latency_ewma = latency if self.latency_ewma is None else 0.9 * self.latency_ewma + 0.1 * latency
+            self.latency_floor = latency if self.latency_floor is None else min(self.latency_floor, latency)
+            # Latencia muy por encima de la mínima observada: el objetivo se está saturando
+            if self.latency_ewma > max(4 * self.latency_floor, 0.05):
+                self._decrease(0.9)
+            elif not self._cooling_down():
+                self.rate = min(self.max_rate, self.rate + 1.0 / self.rate)
+    
+    def on_overload(self):
+        """Decremento multiplicativo ante 429/503 o timeouts"""
+        if not self.adaptive:
+            return
+        with self.lock:
+            self._decrease(0.5)
+    
+    def _cooling_down(self):
+        # Tras un decremento, las respuestas en vuelo aún reflejan la tasa
+        # anterior: ni se vuelve a bajar ni se sube hasta que pase un intervalo
+        return time.monotonic() - self.last_decrease < max(self.latency_ewma or 0.0, 0.5)
+    
+    def _decrease(self, factor):
+        if self._cooling_down():
+            return
+        self.last_decrease = time.monotonic()
+        self.rate = max(self.min_rate, self.rate * factor)
+        self.burst = max(1.0, min(self.burst, self.rate / 10))
+
+
+class CircuitBreaker:
+    """Cortacircuitos de un host: pausa sus requests cuando deja de responder
+    
+    Tras `threshold` errores de conexión o timeouts seguidos se abre y nadie
+    envía requests a ese host durante el backoff. Después, un único request de
+    prueba (half-open) comprueba si ha vuelto: si responde se reanuda el escaneo,
+    si falla el backoff se duplica (hasta `max_backoff`). Si el host sigue caído
+    más de `abort_after` segundos se abandona.
+    """
+    
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half-open'
+    # Espera de los requests retenidos mientras el de prueba está en vuelo
+    POLL_INTERVAL = 0.25
+    
+    def __init__(self, threshold=DEFAULT_BREAKER_THRESHOLD, backoff=1.0, max_backoff=60.0,
+                 abort_after=DEFAULT_ABORT_AFTER):
+        self.threshold = threshold
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.abort_after = abort_after
+        self.state = self.CLOSED
+        self.failures = 0
+        self.delay = backoff
+        self.reopen_at = 0.0
+        self.changed_at = 0.0
+        self.down_since = None
+        self.trips = 0
+        self.aborted = False
+        self.lock = threading.Lock()
+    
+    def reserve(self):
+        """Segundos que hay que esperar antes de enviar un request (0: ya), o None si se abandonó el host"""
+        with self.lock:
+            if self.aborted:
+                return None
+            if self.state == self.CLOSED:
+                return 0.0
+            now = time.perf_counter()
+            if self.state == self.OPEN and now >= self.reopen_at:
+                # Este request es la prueba de recuperación
+                self.state = self.HALF_OPEN
+                self.changed_at = now
+                return 0.0
+            if self.state == self.HALF_OPEN:
+                return self.POLL_INTERVAL
+            return self.reopen_at - now
+    
+    def record_success(self):
+        """Respuesta recibida; True si el host vuelve a responder tras una pausa"""
+        # Camino rápido sin lock: el host respondía y no hay errores que olvidar
+        if self.state == self.CLOSED and not self.failures:
+            return False
+        with self.lock:
+            # Abierto solo puede responder un request enviado antes de la pausa: no prueba nada
+            if self.state == self.OPEN:
+                return False
+            recovered = self.state != self.CLOSED
+            self.state = self.CLOSED
+            self.failures = 0
+            self.delay = self.backoff
+            self.down_since = None
+            return recovered
+    
+    def record_failure(self, started_at):
+        """Error de conexión o timeout de un request iniciado en `started_at` (perf_counter)
+        
+        Devuelve 'open' si el circuito se abre, 'abort' si se abandona el host o None.
+        """
+        with self.lock:
+            # Requests que ya estaban en vuelo cuando cambió el estado: no aportan nada nuevo
+            if self.aborted or (self.state != self.CLOSED and started_at < self.changed_at):
+                return None
+            self.failures += 1
+            now = time.perf_counter()
+            if self.state == self.HALF_OPEN:
+                self.delay = min(self.delay * 2, self.max_backoff)
+                return self._open(now)
+            if self.state == self.CLOSED and self.failures >= self.threshold:
+                self.trips += 1
+                self.down_since = now
+                return self._open(now)
+            return None
+    
+    def _open(self, now):
+        if now - self.down_since >= self.abort_after:
+            self.aborted = True
+            return 'abort'
+        self.state = self.OPEN
+        self.changed_at = now
+        self.reopen_at = now + self.delay
+        return 'open'
+
+
+class ResultSink:
+    """Salida de resultados en streaming: cada hallazgo se escribe al llegar"""
+    
+    def __init__(self, path, append=False, flush_every=50, flush_interval=1.0):
+        self.path = path
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.file = open(path, 'a' if append else 'w', encoding='utf-8', newline='')
+        self.unflushed = 0
+        self.last_flush = time.monotonic()
+        self.written = 0
+    
+    def write(self, result):
+        """Escribir un resultado y volcar al disco por lotes"""
+        self.write_record(result)
+        self.written += 1
+        self.unflushed += 1
+        if (self.unflushed >= self.flush_every
+                or time.monotonic() - self.last_flush >= self.flush_interval):
+            self.flush()
+    
+    def write_record(self, result):
+        raise NotImplementedError
+    
+    def flush(self):
+        self.file.flush()
+        self.unflushed = 0
+        self.last_flush = time.monotonic()
+    
+    def close(self):
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+
+class JsonLinesSink(ResultSink):
+    """Un objeto JSON por línea (JSON Lines)"""
+    
+    def write_record(self, result):
+        self.file.write(json.dumps(result, ensure_ascii=False) + '\n')
+
+
+class CsvSink(ResultSink):
+    """CSV con una fila por resultado"""
+    
+    FIELDS = ['url', 'status_code', 'content_length', 'directory']
+    
+    def __init__(self, path, append=False, fields=None, **kwargs):
+        super().__init__(path, append=append, **kwargs)
+        self.writer = csv.DictWriter(self.file, fieldnames=fields or self.FIELDS, extrasaction='ignore')
+        # Cabecera solo si el archivo empieza vacío
+        if self.file.tell() == 0:
+            self.writer.writeheader()
+    
+    def write_record(self, result):
+        self.writer.writerow(result)
+
+
+RESULT_SINKS = {
+    'jsonl': JsonLinesSink,
+    'csv': CsvSink
+}
+
+
+class ShardLink:
+    """Canal entre un proceso worker (--processes) y el proceso principal
+    
+    Hacia el principal viajan lotes de eventos (hallazgos, rutas completadas) junto
+    con una instantánea de las estadísticas; hacia el worker, los directorios que
+    hay que añadir a su frontera y la orden de parar.
+    """
+    
+    def __init__(self, index, events, commands, track_completed=False,
+                 flush_every=256, flush_interval=0.2, poll_interval=0.05):
+        self.index = index
+        self.events = events
+        self.commands = commands
+        self.track_completed = track_completed
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.poll_interval = poll_interval
+        self.buffer = []
+        self.last_flush = time.monotonic()
+        self.last_poll = 0.0
+        # Directorios recibidos: el principal lo usa para saber si un worker ocioso está al día
+        self.received = 0
+    
+    def send(self, *event):
+        """Encolar un evento; se envían por lotes"""
+        self.buffer.append(event)
+    
+    def maybe_flush(self, stats):
+        """Enviar el lote pendiente si es grande o ha pasado el intervalo"""
+        if (len(self.buffer) >= self.flush_every
+                or time.monotonic() - self.last_flush >= self.flush_interval):
+            self.flush(stats)
+    
+    def flush(self, stats, state='busy'):
+        """Enviar el lote pendiente y el estado del worker (busy, idle o done)"""
+        batch, self.buffer = self.buffer, []
+        self.events.put((self.index, batch, stats.snapshot(), state, self.received))
+        self.last_flush = time.monotonic()
+    
+    def poll(self):
+        """Órdenes pendientes del principal, sin bloquear (como mucho cada poll_interval)"""
+        now = time.monotonic()
+        if now - self.last_poll < self.poll_interval:
+            return []
+        self.last_poll = now
+        commands = []
+        while True:
+            try:
+                commands.append(self.commands.get_nowait())
+            except queue.Empty:
+                return commands
+    
+    def wait(self, stats):
+        """Avisar de que el worker está ocioso y bloquear hasta la siguiente orden"""
+        self.flush(stats, state='idle')
+        first = self.commands.get()
+        self.last_poll = 0.0
+        return [first] + self.poll()
+
+
+class ScanCoordinator:
+    """Estado del coordinador distribuido: reparte chunks con lease y recoge resultados
+    
+    Un chunk es un lote de trabajos (base_url, entrada, profundidad, offset) sacados
+    de la frontera. Si el worker que lo tiene no lo completa (ni renueva el lease)
+    antes de lease_timeout, el chunk vuelve a la cola y se asigna a otro worker.
+    """
+    
+    def __init__(self, dirforcer, frontier, status_codes, chunk_size=500, lease_timeout=60.0, token=None):
+        self.dirforcer = dirforcer
+        self.frontier = frontier
+        self.status_codes = status_codes
+        self.chunk_size = chunk_size
+        self.lease_timeout = lease_timeout
+        self.token = token
+        self.lock = threading.Lock()
+        # chunk_id -> [trabajos, worker, vencimiento del lease]
+        self.leases = {}
+        self.retry = deque()
+        self.workers = {}
+        self.chunks_completed = 0
+        self.chunks_reassigned = 0
+    
+    def authorized(self, token):
+        """Comprobar el token compartido (si se configuró)"""
+        return self.token is None or hmac.compare_digest(token or '', self.token)
+    
+    def lease(self, worker):
+        """Asignar el siguiente chunk a un worker"""
+        with self.lock:
+            self.expire_leases()
+            if self.dirforcer.stop_scanning:
+                return {'done': True}
+            jobs = self.retry.popleft() if self.retry else self.take_jobs()
+            if not jobs:
+                # Los chunks en curso aún pueden descubrir directorios (modo recursivo)
+                return {'wait': 1.0} if self.leases else {'done': True}
+            
+            chunk_id = uuid.uuid4().hex
+            self.leases[chunk_id] = [jobs, worker, time.monotonic() + self.lease_timeout]
+            bases = {job[0] for job in jobs}
+            return {
+                'chunk': chunk_id,
+                'jobs': jobs,
+                'status_codes': self.status_codes,
+                'lease_timeout': self.lease_timeout,
+                'wildcard': {base: self.dirforcer.wildcard_filters[base].to_dict()
+                             for base in bases if base in self.dirforcer.wildcard_filters}
+            }
+    
+    def take_jobs(self):
+        """Sacar hasta chunk_size trabajos de la frontera"""
+        jobs = []
+        while len(jobs) < self.chunk_size:
+            job = self.frontier.next_job()
+            if job is None:
+                break
+            jobs.append(job)
+        return jobs
+    
+    def heartbeat(self, chunk_id):
+        """Renovar el lease de un chunk; False si ya venció y se reasignó"""
+        with self.lock:
+            lease = self.leases.get(chunk_id)
+            if lease is None:
+                return False
+            lease[2] = time.monotonic() + self.lease_timeout
+            return True
+    
+    def complete(self, worker, chunk_id, results, stats):
+        """Registrar un chunk terminado; False si el lease ya no es válido"""
+        with self.lock:
+            lease = self.leases.pop(chunk_id, None)
+            if lease is None:
+                return False
+            jobs = lease[0]
+            dirforcer = self.dirforcer
+            
+            if worker not in self.workers:
+                self.workers[worker] = dirforcer.stats.remote_worker()
+            self.workers[worker].add(stats)
+            
+            jobs_by_url = {urljoin(job[0] + '/', job[1]): job for job in jobs} if results else {}
+            for result in results:
+                job = jobs_by_url.get(result['url'])
+                if job is None:
+                    continue
+                base_url, _, depth, _, word = job
+                if dirforcer.multi_target:
+                    result['host'] = urlparse(base_url).netloc
+                dirforcer.stats.add_result(result)
+                dirforcer.handle_found(result, base_url, depth, self.frontier, word)
+            
+            for job in jobs:
+                self.frontier.job_done(job)
+                if dirforcer.journal is not None:
+                    dirforcer.journal.record_completed(job[0], job[3])
+            self.chunks_completed += 1
+            return True
+    
+    def expire_leases(self):
+        """Devolver a la cola los chunks cuyo lease ha vencido (llamar con el lock)"""
+        now = time.monotonic()
+        for chunk_id, (jobs, worker, expires) in list(self.leases.items()):
+            if expires < now:
+                del self.leases[chunk_id]
+                self.retry.append(jobs)
+                self.chunks_reassigned += 1
+                self.dirforcer.logger.warning(f"Lease vencido para el worker {worker}; "
+                                              f"el chunk ({len(jobs)} trabajos) se reasignará")
+    
+    def finished(self):
+        """Comprobar si no queda trabajo pendiente ni en curso"""
+        with self.lock:
+            self.expire_leases()
+            if self.leases or self.retry:
+                return False
+            jobs = self.take_jobs()
+            if jobs:
+                self.retry.append(jobs)
+                return False
+            return True
+
+
+class CoordinatorHandler(BaseHTTPRequestHandler):
+    """API JSON del coordinador: POST /lease, /heartbeat y /complete"""
+    
+    def do_POST(self):
+        coordinator = self.server.coordinator
+        if not coordinator.authorized(self.headers.get('X-DirForcer-Token')):
+            return self.send_json(403, {'error': 'token inválido'})
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            payload = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            return self.send_json(400, {'error': 'JSON inválido'})
+        if not isinstance(payload, dict):
+            return self.send_json(400, {'error': 'se esperaba un objeto JSON'})
+        
+        if self.path == '/lease':
+            return self.send_json(200, coordinator.lease(payload.get('worker', self.client_address[0])))
+        if self.path == '/heartbeat':
+            ok = coordinator.heartbeat(payload.get('chunk'))
+            return self.send_json(200 if ok else 409, {'ok': ok})
+        if self.path == '/complete':
+            results, stats = payload.get('results', []), payload.get('stats', {})
+            error = self.invalid_completion(results, stats)
+            if error:
+                return self.send_json(400, {'error': error})
+            ok = coordinator.complete(payload.get('worker', self.client_address[0]), payload.get('chunk'),
+                                      results, stats)
+            return self.send_json(200 if ok else 409, {'ok': ok})
+        self.send_json(404, {'error': 'ruta desconocida'})
+    
+    def invalid_completion(self, results, stats):
+        """Motivo por el que un POST /complete está mal formado, o None"""
+        if not isinstance(results, list) or not all(
+                isinstance(result, dict) and {'url', 'directory', 'status_code'} <= result.keys()
+                for result in results):
+            return 'results debe ser una lista de hallazgos con url, directory y status_code'
+        if not isinstance(stats, dict) or not all(
+                isinstance(stats.get(field, 0), int) for field in WorkerStats.COUNTERS):
+            return 'stats debe ser un objeto con contadores enteros'
+        if not isinstance(stats.get('histogram', []), list) or not all(
+                isinstance(count, int) for count in stats.get('histogram', [])):
+            return 'stats.histogram debe ser una lista de enteros'
+        return None
+    
+    def send_json(self, status, data):
+        body = json.dumps(data).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        """Silenciar el log de acceso"""
+        pass
+
+
+class SessionReuseSSLContext(ssl.SSLContext):
+    """Contexto TLS que reanuda la sesión TLS anterior de cada host en conexiones nuevas"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        # (host, puerto) -> última sesión TLS; lo comparten todos los threads del pool
+        self.tls_sessions = {}
+        self.sessions_lock = threading.Lock()
+        # En TLS 1.3 el ticket de sesión llega después del handshake y la
+        # conexión puede cerrarse antes de leerlo; con TLS 1.2 la sesión queda
+        # disponible en cuanto termina el handshake
+        self.maximum_version = ssl.TLSVersion.TLSv1_2
+    
+    def wrap_socket(self, sock, *args, server_hostname=None, session=None, **kwargs):
+        # Dos servicios del mismo host en puertos distintos no comparten sesión
+        try:
+            key = (server_hostname, sock.getpeername()[1])
+        except (OSError, IndexError):
+            key = (server_hostname, None)
+        if session is None:
+            with self.sessions_lock:
+                session = self.tls_sessions.get(key)
+        ssl_sock = super().wrap_socket(sock, *args, server_hostname=server_hostname,
+                                       session=session, **kwargs)
+        if ssl_sock.session is not None:
+            with self.sessions_lock:
+                self.tls_sessions[key] = ssl_sock.session
+        return ssl_sock
+
+
+class ProfileRecord:
+    """Tiempos por fase de un único request (--profile)"""
+    
+    __slots__ = ('started', 'last', 'phases', 'nested', 'open', 'events')
+    
+    def __init__(self, trace=False):
+        self.started = self.last = time.perf_counter()
+        self.phases = {}
+        # Tiempo de fases anidadas (DNS, TCP, TLS) desde la última marca
+        self.nested = 0.0
+        self.open = {}
+        self.events = [] if trace else None
+    
+    def add(self, phase, start, end):
+        """Registrar una fase anidada dentro de la fase en curso"""
+        duration = end - start
+        self.phases[phase] = self.phases.get(phase, 0.0) + duration
+        self.nested += duration
+        if self.events is not None:
+            self.events.append((phase, start, duration))
+    
+    def mark(self, phase):
+        """Cerrar la fase en curso: el tiempo desde la última marca, sin las fases anidadas"""
+        now = time.perf_counter()
+        self.phases[phase] = self.phases.get(phase, 0.0) + max(0.0, now - self.last - self.nested)
+        if self.events is not None:
+            self.events.append((phase, self.last, now - self.last))
+        self.last = now
+        self.nested = 0.0
+
+
+class ScanProfiler:
+    """Perfilado opcional (--profile): tiempos por fase de cada request, cProfile o traza Chrome
+    
+    Cada thread acumula sus fases en su propio slot (como ScanStats), así el
+    camino caliente no toma locks; la salida .json es una traza para
+    chrome://tracing o Perfetto y cualquier otra extensión un volcado pstats.
+    """
+    
+    PHASES = ('throttle', 'dns', 'connect', 'tls', 'wait', 'read', 'python')
+    MAX_TRACE_EVENTS = 1_000_000
+    
+    # Request en curso del thread actual, para las conexiones de urllib3
+    _local = threading.local()
+    
+    def __init__(self, output=None):
+        self.output = output
+        self.trace = output is not None and output.lower().endswith('.json')
+        self.origin = time.perf_counter()
+        self.slots = []
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.events = []
+        self.truncated = False
+        self.profiles = []
+        self.profile = cProfile.Profile() if output is not None and not self.trace else None
+    
+    @classmethod
+    def current(cls):
+        """Registro del request en curso en este thread (o None)"""
+        return getattr(cls._local, 'record', None)
+    
+    def begin(self, bind=True):
+        """Empezar a medir un request; bind lo asocia al thread actual (motor de threads)"""
+        record = ProfileRecord(self.trace)
+        if bind:
+            ScanProfiler._local.record = record
+        return record
+    
+    def end(self, record, url, lane=None):
+        """Cerrar un request: el tiempo restante es overhead de Python"""
+        ScanProfiler._local.record = None
+        # Sin respuesta (timeout, conexión cortada) el tiempo restante fue espera de red
+        record.mark('python' if 'wait' in record.phases else 'wait')
+        
+        slot = getattr(self.local, 'slot', None)
+        if slot is None:
+            slot = {phase: [0.0, LatencyHistogram()] for phase in self.PHASES + ('total',)}
+            with self.lock:
+                self.slots.append(slot)
+            self.local.slot = slot
+        for phase, seconds in record.phases.items():
+            entry = slot[phase]
+            entry[0] += seconds
+            entry[1].record(seconds * 1000)
+        total = record.last - record.started
+        slot['total'][0] += total
+        slot['total'][1].record(total * 1000)
+        
+        if record.events is not None and not self.truncated:
+            tid = lane if lane is not None else threading.get_ident()
+            events = [{'name': 'request', 'cat': 'request', 'ph': 'X', 'pid': os.getpid(), 'tid': tid,
+                       'ts': (record.started - self.origin) * 1e6, 'dur': total * 1e6, 'args': {'url': url}}]
+            events.extend({'name': phase, 'cat': 'phase', 'ph': 'X', 'pid': os.getpid(), 'tid': tid,
+                           'ts': (start - self.origin) * 1e6, 'dur': duration * 1e6}
+                          for phase, start, duration in record.events)
+            with self.lock:
+                if len(self.events) + len(events) > self.MAX_TRACE_EVENTS:
+                    self.truncated = True
+                else:
+                    self.events.extend(events)
+    
+    def trace_config(self):
+        """TraceConfig de aiohttp que mide DNS y conexión (TCP + TLS) de cada request"""
+        config = aiohttp.TraceConfig()
+        
+        def opener(name):
+            async def callback(session, context, params):
+                if isinstance(context.trace_request_ctx, ProfileRecord):
+                    context.trace_request_ctx.open[name] = time.perf_counter()
+            return callback
+        
+        def closer(name):
+            async def callback(session, context, params):
+                record = context.trace_request_ctx
+                if isinstance(record, ProfileRecord) and name in record.open:
+                    record.add(name, record.open.pop(name), time.perf_counter())
+            return callback
+        
+        config.on_dns_resolvehost_start.append(opener('dns'))
+        config.on_dns_resolvehost_end.append(closer('dns'))
+        config.on_connection_create_start.append(opener('connect'))
+        config.on_connection_create_end.append(closer('connect'))
+        return config
+    
+    # Eventos de trace de httpcore (--http2) -> fase; el DNS queda dentro de connect
+    HTTPCORE_PHASES = {'connection.connect_tcp': 'connect', 'connection.start_tls': 'tls'}
+    
+    def httpcore_trace(self, record):
+        """Callback de trace de httpcore que mide conexión y TLS de un request"""
+        async def trace(event, info):
+            name, _, stage = event.rpartition('.')
+            phase = self.HTTPCORE_PHASES.get(name)
+            if phase is None:
+                return
+            if stage == 'started':
+                record.open[phase] = time.perf_counter()
+            elif phase in record.open:
+                record.add(phase, record.open.pop(phase), time.perf_counter())
+        return trace
+    
+    def profile_thread(self):
+        """Inicializador de los threads del pool: un cProfile por thread"""
+        # Desde Python 3.12 cProfile usa sys.monitoring y ya cubre todos los threads
+        if self.profile is not None and sys.version_info < (3, 12):
+            profile = cProfile.Profile()
+            with self.lock:
+                self.profiles.append(profile)
+            profile.enable()
+    
+    def start(self):
+        if self.profile is not None:
+            self.profile.enable()
+    
+    def stop(self):
+        if self.profile is not None:
+            self.profile.disable()
+    
+    def summary(self):
+        """Tiempo total, porcentaje y percentiles de cada fase"""
+        phases = {}
+        for phase in self.PHASES + ('total',):
+            seconds = sum(slot[phase][0] for slot in self.slots)
+            histogram = LatencyHistogram()
+            for slot in self.slots:
+                histogram.merge(slot[phase][1])
+            phases[phase] = {'seconds': seconds, 'count': sum(histogram.counts),
+                             'p50_ms': histogram.percentile(50), 'p99_ms': histogram.percentile(99)}
+        total = phases['total']['seconds']
+        for values in phases.values():
+            values['percent'] = values['seconds'] / total * 100 if total else 0.0
+        return {phase: {key: round(value, 3) for key, value in values.items()}
+                for phase, values in phases.items()}
+    
+    def dump(self):
+        """Escribir la traza Chrome o el volcado pstats"""
+        if self.output is None:
+            return
+        if self.trace:
+            with open(self.output, 'w', encoding='utf-8') as f:
+                json.dump({'traceEvents': self.events, 'displayTimeUnit': 'ms',
+                           'otherData': {'truncated': self.truncated}}, f)
+            return
+        stats = pstats.Stats(self.profile)
+        for profile in self.profiles:
+            profile.disable()
+            stats.add(profile)
+        stats.dump_stats(self.output)
+
+
+class DNSCache:
+    """Caché de resoluciones DNS de todo el proceso, con TTL e IPs fijadas (--resolve)
+    
+    getaddrinfo no expone el TTL de los registros, así que cada resolución se
+    conserva un tiempo fijo. Las IPs fijadas no caducan nunca.
+    """
+    
+    def __init__(self, ttl=300.0):
+        self.ttl = ttl
+        # (host, puerto) -> (caducidad, [(familia, ip), ...])
+        self.entries = {}
+        self.pinned = {}
+        # Un lock por host: las conexiones simultáneas a un host nuevo resuelven una sola vez
+        self.locks = {}
+        self.lookups = 0
+        self.hits = 0
+    
+    def pin(self, host, ip):
+        """Fijar la IP de un host (como --resolve de curl)"""
+        self.pinned[host.lower().rstrip('.')] = ip
+    
+    def cached(self, host, port):
+        """Direcciones en caché (o fijadas) de host:puerto, o None si hay que resolver"""
+        host = host.lower().rstrip('.')
+        ip = self.pinned.get(host)
+        if ip is not None:
+            return [(socket.AF_INET6 if ':' in ip else socket.AF_INET, ip)]
+        entry = self.entries.get((host, port))
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+        return None
+    
+    def resolve(self, host, port):
+        """Direcciones de host:puerto; solo llama a getaddrinfo si no están en caché"""
+        addresses = self.cached(host, port)
+        if addresses is None:
+            key = (host.lower().rstrip('.'), port)
+            with self.locks.setdefault(key, threading.Lock()):
+                # Otro thread pudo resolverlo mientras se esperaba el lock
+                addresses = self.cached(host, port)
+                if addresses is None:
+                    infos = socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)
+                    addresses = list(dict.fromkeys((family, info[0]) for family, _, _, _, info in infos))
+                    self.entries[key] = (time.monotonic() + self.ttl, addresses)
+                    self.lookups += 1
+                    return addresses
+        self.hits += 1
+        return addresses
+    
+    async def resolve_async(self, host, port):
+        """Como resolve(), con getaddrinfo en el executor por defecto si no está en caché"""
+        addresses = self.cached(host, port)
+        if addresses is None:
+            return await asyncio.get_running_loop().run_in_executor(None, self.resolve, host, port)
+        self.hits += 1
+        return addresses
+    
+    def invalidate(self, host, port):
+        """Olvidar una resolución (p. ej. la IP dejó de aceptar conexiones)"""
+        self.entries.pop((host.lower().rstrip('.'), port), None)
+
+
+# Caché compartida por todas las sesiones y motores del proceso
+DNS_CACHE = DNSCache()
+
+
+class CachedDNSResolver:
+    """Resolver de aiohttp que usa DNS_CACHE (getaddrinfo en el executor por defecto)"""
+    
+    async def resolve(self, host, port=0, family=socket.AF_INET):
+        addresses = await DNS_CACHE.resolve_async(host, port)
+        return [{'hostname': host, 'host': ip, 'port': port, 'family': address_family,
+                 'proto': 0, 'flags': socket.AI_NUMERICHOST}
+                for address_family, ip in addresses
+                if family == socket.AF_UNSPEC or address_family == family]
+    
+    async def close(self):
+        pass
+
+
+class CachedDNSNetworkBackend:
+    """Backend de red de httpcore (--http2) que resuelve con DNS_CACHE"""
+    
+    def __init__(self):
+        self.backend = httpcore.AnyIOBackend()
+    
+    async def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        # httpcore usa el host original para SNI, así que basta con conectar a la IP.
+        # Como socket.create_connection, se prueba cada dirección en orden
+        addresses = await DNS_CACHE.resolve_async(host, port)
+        error = None
+        for _, ip in addresses:
+            try:
+                return await self.backend.connect_tcp(ip, port, timeout, local_address, socket_options)
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                error = e
+        # Ninguna dirección acepta conexiones: volver a resolver en el próximo intento
+        DNS_CACHE.invalidate(host, port)
+        raise error
+    
+    async def connect_unix_socket(self, path, timeout=None, socket_options=None):
+        return await self.backend.connect_unix_socket(path, timeout, socket_options)
+    
+    async def sleep(self, seconds):
+        await self.backend.sleep(seconds)
+
+
+def httpx_error(error):
+    """Excepción de httpx equivalente a una de httpcore (la más específica), o None"""
+    # httpx define una excepción con el mismo nombre para cada una de httpcore
+    for error_class in type(error).__mro__:
+        if error_class.__module__.startswith('httpcore') and hasattr(httpx, error_class.__name__):
+            return getattr(httpx, error_class.__name__)(str(error))
+    return None
+
+
+class CachedDNSTransport:
+    """Transporte de httpx (--http2) sobre un pool de httpcore que resuelve con DNS_CACHE
+    
+    httpx no deja elegir el backend de red de su transporte, así que el pool se crea
+    aquí y las excepciones de httpcore se traducen a las de httpx, que son las que
+    tratan los motores.
+    """
+    
+    def __init__(self, ssl_context, max_connections):
+        # Solo se abre más de una conexión por host si el objetivo no negocia h2 (ALPN)
+        self.pool = httpcore.AsyncConnectionPool(
+            ssl_context=ssl_context,
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=5.0,
+            http1=True,
+            http2=True,
+            network_backend=CachedDNSNetworkBackend()
+        )
+    
+    async def handle_async_request(self, request):
+        core_request = httpcore.Request(
+            method=request.method,
+            url=httpcore.URL(scheme=request.url.raw_scheme, host=request.url.raw_host,
+                             port=request.url.port, target=request.url.raw_path),
+            headers=request.headers.raw,
+            content=request.stream,
+            extensions=request.extensions
+        )
+        try:
+            response = await self.pool.handle_async_request(core_request)
+        except Exception as e:
+            error = httpx_error(e)
+            if error is None:
+                raise
+            raise error from e
+        return httpx.Response(status_code=response.status, headers=response.headers,
+                              stream=CachedDNSResponseStream(response.stream),
+                              extensions=response.extensions)
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+    
+    async def aclose(self):
+        await self.pool.aclose()
+
+
+class CachedDNSResponseStream(httpx.AsyncByteStream if httpx is not None else object):
+    """Cuerpo de una respuesta de CachedDNSTransport, con los errores de lectura traducidos"""
+    
+    def __init__(self, stream):
+        self.stream = stream
+    
+    async def __aiter__(self):
+        try:
+            async for chunk in self.stream:
+                yield chunk
+        except Exception as e:
+            error = httpx_error(e)
+            if error is None:
+                raise
+            raise error from e
+    
+    async def aclose(self):
+        await self.stream.aclose()
+
+
+class CachedDNSConnectionMixin:
+    """Conexión urllib3 que resuelve con DNS_CACHE y, con --profile, separa DNS, TCP y TLS"""
+    
+    def _new_conn(self):
+        record = ScanProfiler.current()
+        host = self._dns_host
+        started = time.perf_counter()
+        try:
+            addresses = DNS_CACHE.resolve(host, self.port)
+        except OSError:
+            # El error de resolución lo reporta urllib3 al conectar
+            return super()._new_conn()
+        resolved = time.perf_counter()
+        if record is not None:
+            record.add('dns', started, resolved)
+        
+        # Conectar a las IPs resueltas en orden, como socket.create_connection; el host
+        # original se restaura para SNI y la cabecera Host
+        try:
+            for _, ip in addresses:
+                self._dns_host = ip
+                try:
+                    sock = super()._new_conn()
+                    break
+                except (OSError, ConnectTimeoutError) as e:
+                    error = e
+            else:
+                # Ninguna dirección acepta conexiones: volver a resolver en el próximo intento
+                DNS_CACHE.invalidate(host, self.port)
+                raise error
+        finally:
+            self._dns_host = host
+        self._profile_connected_at = time.perf_counter()
+        if record is not None:
+            record.add('connect', resolved, self._profile_connected_at)
+        return sock
+    
+    def connect(self):
+        record = ScanProfiler.current()
+        self._profile_connected_at = None
+        super().connect()
+        # En HTTPS, connect() es _new_conn (DNS + TCP) seguido del handshake TLS
+        if record is not None and self._profile_connected_at is not None and isinstance(self, HTTPSConnection):
+            record.add('tls', self._profile_connected_at, time.perf_counter())
+
+
+class CachedDNSHTTPConnection(CachedDNSConnectionMixin, HTTPConnection):
+    pass
+
+
+class CachedDNSHTTPSConnection(CachedDNSConnectionMixin, HTTPSConnection):
+    pass
+
+
+class CachedDNSHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = CachedDNSHTTPConnection
+
+
+class CachedDNSHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = CachedDNSHTTPSConnection
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter con un único contexto TLS compartido, TCP keep-alive y timeouts por defecto"""
+    
+    def __init__(self, ssl_context=None, tcp_keepalive=True, timeout=None, verify=True, **kwargs):
+        self.ssl_context = ssl_context
+        self.tcp_keepalive = tcp_keepalive
+        # Con --no-ssl-verify, REQUESTS_CA_BUNDLE / CURL_CA_BUNDLE no deben volver a activar
+        # la verificación (requests los aplica por encima de Session.verify)
+        self.verify = verify
+        # (conexión, lectura) para los requests que no indican timeout: requests
+        # ignora Session.timeout y sin esto un socket colgado bloquea su worker
+        self.timeout = timeout
+        super().__init__(**kwargs)
+    
+    def send(self, request, stream=False, timeout=None, verify=True, **kwargs):
+        if timeout is None:
+            timeout = self.timeout
+        if not self.verify:
+            verify = False
+        return super().send(request, stream=stream, timeout=timeout, verify=verify, **kwargs)
+    
+    def init_poolmanager(self, *args, **kwargs):
+        if self.ssl_context is not None:
+            kwargs['ssl_context'] = self.ssl_context
+        socket_options = list(HTTPConnection.default_socket_options)
+        if self.tcp_keepalive:
+            socket_options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+        kwargs['socket_options'] = socket_options
+        super().init_poolmanager(*args, **kwargs)
+        # Conexiones que resuelven con la caché DNS del proceso (y miden fases con --profile)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': CachedDNSHTTPConnectionPool,
+            'https': CachedDNSHTTPSConnectionPool
+        }
+
+
 class DirForcerPro:
     def __init__(self):
         self.session = requests.Session()
-        self.found_dirs = []
-        self.total_requests = 0
-        self.successful_requests = 0
-        self.failed_requests = 0
+        self.stats = ScanStats()
         self.start_time = None
         self.stop_scanning = False
+        self.probe_mode = 'get'
+        self.ssl_context = None
+        self.pool_settings = {}
+        # (conexión, lectura) en segundos, fijados por setup_session
+        self.timeouts = (DEFAULT_CONNECT_TIMEOUT, 10)
+        self.wildcard_filters = {}
+        self.journal = None
+        self.result_sink = None
+        self.rate_limiter = None
+        self.multi_target = False
+        # Canal con el proceso principal cuando esta instancia es un worker de --processes
+        self.shard_link = None
+        self.profiler = None
+        self.http2 = False
+        self.hit_stats = None
+        self.response_cache = None
+        # Cortacircuitos por host (None: desactivado) y sus parámetros
+        self.breaker_settings = None
+        self.breakers = {}
+        # host -> error TLS determinista (certificado, versión...) por el que se abandonó
+        self.tls_failures = {}
+        # Muestras (instante, completados) para los requests/segundo de la línea de estado
+        self.throughput_samples = deque()
+        self.last_status = 0.0
         
         # Configurar logging
         self.setup_logging()
         
         # Configurar signal handlers para interrupción elegante
         signal.signal(signal.SIGINT, self.signal_handler)
+    
+    @property
+    def found_dirs(self):
+        return self.stats.results
+    
+    @property
+    def total_requests(self):
+        return self.stats.total_requests
+    
+    @property
+    def successful_requests(self):
+        return self.stats.successful_requests
+    
+    @property
+    def failed_requests(self):
+        return self.stats.failed_requests
         
     def setup_logging(self):
         """Configurar sistema de logging"""
@@ -53,6 +2235,8 @@ class DirForcerPro:
             ]
         )
         self.logger = logging.getLogger(__name__)
+        # httpx (--http2) registra cada request en INFO
+        logging.getLogger('httpx').setLevel(logging.WARNING)
     
     def signal_handler(self, signum, frame):
         """Manejar interrupción del usuario (Ctrl+C)"""
@@ -73,7 +2257,9 @@ class DirForcerPro:
             self.logger.error(f"URL inválida: {url}")
             return None
     
-    def setup_session(self, user_agent=None, timeout=10, verify_ssl=True):
+    def setup_session(self, user_agent=None, timeout=10, verify_ssl=True, pool_size=10,
+                      keep_alive=True, tls_session_reuse=False, hosts=1, resolve=None, dns_ttl=None,
+                      connect_timeout=None):
         """Configurar sesión de requests con headers personalizados"""
         if user_agent:
             self.session.headers.update({'User-Agent': user_agent})
@@ -87,56 +2273,579 @@ class DirForcerPro:
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
             'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive',
+            'Connection': 'keep-alive' if keep_alive else 'close',
             'Upgrade-Insecure-Requests': '1'
         })
         
-        self.session.timeout = timeout
+        # timeout es el de lectura; el de conexión es más corto salvo que se indique
+        self.timeouts = (connect_timeout or min(timeout, DEFAULT_CONNECT_TIMEOUT), timeout)
         self.session.verify = verify_ssl
+        if not verify_ssl:
+            # --no-ssl-verify es explícito: sin un aviso de urllib3 por cada request
+            disable_warnings(InsecureRequestWarning)
+        
+        # Un único contexto TLS para todas las conexiones de requests: los certificados
+        # se cargan una sola vez en lugar de en cada handshake. urllib3 lo modifica
+        # (verificación, CA), así que los motores async crean el suyo
+        self.ssl_context = self.create_ssl_context(verify_ssl, tls_session_reuse)
+        
+        # Pool dimensionado al número de workers para no descartar conexiones
+        adapter = PooledHTTPAdapter(
+            ssl_context=self.ssl_context,
+            tcp_keepalive=keep_alive,
+            timeout=self.timeouts,
+            verify=verify_ssl,
+            pool_connections=max(10, hosts),
+            pool_maxsize=pool_size
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        
+        # Caché DNS del proceso: cada host se resuelve una vez por TTL, o nunca si está fijado
+        if dns_ttl is not None:
+            DNS_CACHE.ttl = dns_ttl
+        for host, ip in (resolve or {}).items():
+            DNS_CACHE.pin(host, ip)
+        
+        self.pool_settings = {
+            'pool_maxsize': pool_size,
+            'keep_alive': keep_alive,
+            'tls_session_reuse': tls_session_reuse
+        }
+    
+    def create_ssl_context(self, verify_ssl=True, tls_session_reuse=False):
+        """Crear un contexto TLS nuevo (uno por motor: requests, aiohttp o httpx)"""
+        context_class = SessionReuseSSLContext if tls_session_reuse else ssl.SSLContext
+        context = context_class(ssl.PROTOCOL_TLS_CLIENT)
+        if verify_ssl:
+            context.load_default_certs()
+            context.load_verify_locations(certifi.where())
+        else:
+            context.check_hostname = False
+            context.verify_mode = ssl.CERT_NONE
+        return context
+    
+    def setup_circuit_breaker(self, threshold, abort_after):
+        """Activar el cortacircuitos por host (threshold 0 lo desactiva)"""
+        if threshold:
+            self.breaker_settings = {'threshold': threshold, 'abort_after': abort_after}
+    
+    def circuit_breaker(self, base_url):
+        """Cortacircuitos del host de una URL (None si está desactivado)"""
+        if self.breaker_settings is None:
+            return None
+        host = urlparse(base_url).netloc
+        breaker = self.breakers.get(host)
+        if breaker is None:
+            breaker = self.breakers.setdefault(host, CircuitBreaker(**self.breaker_settings))
+        return breaker
+    
+    def host_abandoned(self, base_url):
+        """Indicar si se ha abandonado el host de una URL (cortacircuitos o error TLS)"""
+        if self.tls_failures and urlparse(base_url).netloc in self.tls_failures:
+            return True
+        breaker = self.circuit_breaker(base_url)
+        return breaker is not None and breaker.aborted
+    
+    def wait_for_target(self, breaker):
+        """Esperar (bloqueando el thread) a que el host admita requests; False si hay que desistir"""
+        while not self.stop_scanning:
+            wait_time = breaker.reserve()
+            if wait_time is None:
+                return False
+            if wait_time <= 0:
+                return True
+            time.sleep(min(wait_time, CircuitBreaker.POLL_INTERVAL))
+        return False
     
-    def check_directory(self, base_url, directory, status_codes=None, delay=0):
+    async def wait_for_target_async(self, breaker):
+        """Esperar (sin bloquear el event loop) a que el host admita requests; False si hay que desistir"""
+        while not self.stop_scanning:
+            wait_time = breaker.reserve()
+            if wait_time is None:
+                return False
+            if wait_time <= 0:
+                return True
+            await asyncio.sleep(min(wait_time, CircuitBreaker.POLL_INTERVAL))
+        return False
+    
+    def tls_failure(self, error):
+        """Error TLS determinista (certificado, versión, handshake) tras un error de transporte, o None
+        
+        Los cortes durante el handshake (EOF, reset) pueden ser sobrecarga y se tratan
+        como cualquier otro error de conexión.
+        """
+        # Se busca el ssl.SSLError más interno: los de aiohttp también lo son y envuelven el real
+        found = None
+        seen = set()
+        while error is not None and id(error) not in seen:
+            seen.add(id(error))
+            if isinstance(error, ssl.SSLError):
+                found = error
+            # requests/urllib3 guardan la causa en args o en .reason en lugar de encadenarla
+            nested = getattr(error, 'reason', None)
+            if not isinstance(nested, BaseException):
+                nested = next((arg for arg in error.args if isinstance(arg, BaseException)), None)
+            error = error.__cause__ or nested or error.__context__
+        if isinstance(found, (ssl.SSLEOFError, ssl.SSLZeroReturnError, ssl.SSLSyscallError)):
+            return None
+        return found
+    
+    def target_tls_failed(self, base_url, error):
+        """Abandonar un host por un error TLS que no se arregla reintentando (sin cortacircuitos)"""
+        host = urlparse(base_url).netloc
+        if host in self.tls_failures:
+            return
+        self.tls_failures[host] = error
+        if isinstance(error, ssl.SSLCertVerificationError):
+            reason = f"certificado no válido ({error.verify_message}); usa --no-ssl-verify si es autofirmado"
+        else:
+            reason = getattr(error, 'reason', None) or error
+        print(f"\n{Fore.RED}[x] {host}: error TLS, {reason}: se abandona{Style.RESET_ALL}")
+        self.logger.debug(f"Error TLS en {host}: {error}")
+        # Con un solo objetivo no queda nada que escanear
+        if not self.multi_target:
+            self.stop_scanning = True
+    
+    def target_failed(self, breaker, base_url, started_at):
+        """Anotar un error de conexión o timeout en el cortacircuitos y avisar si cambia de estado"""
+        transition = breaker.record_failure(started_at)
+        if transition is None:
+            return
+        host = urlparse(base_url).netloc
+        if transition == 'open':
+            print(f"\n{Fore.YELLOW}[!] {host} no responde: pausa de {breaker.delay:.0f}s antes de "
+                  f"volver a probar{Style.RESET_ALL}")
+            return
+        print(f"\n{Fore.RED}[x] {host} lleva más de {breaker.abort_after:.0f}s sin responder: "
+              f"se abandona{Style.RESET_ALL}")
+        # Sin ningún host vivo no queda nada que escanear
+        if all(other.aborted for other in list(self.breakers.values())):
+            self.stop_scanning = True
+    
+    def check_directory(self, base_url, directory, status_codes=None):
         """Verificar si un directorio existe"""
         if self.stop_scanning:
-            return None
+            # False (en lugar de None) indica que la ruta no llegó a comprobarse
+            return False
             
         url = urljoin(base_url + '/', directory)
+        # --incremental: los negativos recientes no se vuelven a pedir y los aciertos
+        # se revalidan con un request condicional
+        cached = headers = None
+        if self.response_cache is not None:
+            skip, cached, headers = self.incremental_lookup(url, status_codes)
+            if skip:
+                return None
+        if self.tls_failures and self.host_abandoned(base_url):
+            return PERMANENT_FAILURE
+        breaker = self.circuit_breaker(base_url)
+        if breaker is not None and not self.wait_for_target(breaker):
+            return False
+        profile = self.profiler.begin() if self.profiler is not None else None
         
+        # Limitar la tasa global de requests
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        if profile is not None:
+            profile.mark('throttle')
+        
+        started_at = self.stats.request_started()
         try:
-            # Aplicar delay si se especifica
-            if delay > 0:
-                time.sleep(delay)
-            
-            response = self.session.get(url, allow_redirects=False)
-            self.total_requests += 1
+            if self.probe_mode == 'get':
+                if profile is None:
+                    response = self.session.get(url, allow_redirects=False, headers=headers)
+                else:
+                    # En streaming para separar la espera de cabeceras de la lectura del cuerpo
+                    response = self.session.get(url, allow_redirects=False, stream=True, headers=headers)
+                    profile.mark('wait')
+                    response.content
+                    profile.mark('read')
+                return self.process_response(base_url, url, directory, response.status_code,
+                                             len(response.content), status_codes, response.content,
+                                             headers=response.headers, cached=cached)
             
-            # Verificar códigos de estado de interés
-            if status_codes is None:
-                status_codes = [200, 301, 302, 403, 401]
-            
-            if response.status_code in status_codes:
-                self.successful_requests += 1
-                result = {
-                    'url': url,
-                    'status_code': response.status_code,
-                    'content_length': len(response.content),
-                    'directory': directory
-                }
-                self.found_dirs.append(result)
-                return result
-            else:
-                self.failed_requests += 1
-                return None
+            result = self.probe_directory(base_url, url, directory, status_codes, headers, cached)
+            if profile is not None:
+                profile.mark('wait')
+            return result
                 
         except requests.exceptions.RequestException as e:
-            self.failed_requests += 1
+            self.stats.record_error()
+            # requests.exceptions.SSLError es un ConnectionError: se separa antes
+            tls_error = self.tls_failure(e) if isinstance(e, requests.exceptions.SSLError) else None
+            if tls_error is not None:
+                self.target_tls_failed(base_url, tls_error)
+                return PERMANENT_FAILURE
+            if isinstance(e, (requests.exceptions.InvalidURL, requests.exceptions.InvalidSchema,
+                              requests.exceptions.InvalidHeader)):
+                self.logger.debug(f"Request inválido para {url}: {e}")
+                return PERMANENT_FAILURE
+            if self.rate_limiter is not None and isinstance(e, requests.exceptions.Timeout):
+                self.rate_limiter.on_overload()
+            if breaker is not None and isinstance(e, (requests.exceptions.ConnectionError,
+                                                      requests.exceptions.Timeout)):
+                self.target_failed(breaker, base_url, started_at)
+            self.logger.debug(f"Error al verificar {url}: {e}")
+            return False
+        finally:
+            latency = self.stats.request_finished(started_at)
+            if self.rate_limiter is not None:
+                self.rate_limiter.on_complete(latency)
+            if profile is not None:
+                self.profiler.end(profile, url)
+    
+    async def check_directory_async(self, http, base_url, directory, status_codes=None):
+        """Verificar si un directorio existe (versión asíncrona con aiohttp)"""
+        if self.stop_scanning:
+            # False (en lugar de None) indica que la ruta no llegó a comprobarse
+            return False
+        
+        url = urljoin(base_url + '/', directory)
+        # --incremental: los negativos recientes no se vuelven a pedir y los aciertos
+        # se revalidan con un request condicional
+        cached = headers = None
+        if self.response_cache is not None:
+            skip, cached, headers = self.incremental_lookup(url, status_codes)
+            if skip:
+                return None
+        if self.tls_failures and self.host_abandoned(base_url):
+            return PERMANENT_FAILURE
+        breaker = self.circuit_breaker(base_url)
+        if breaker is not None and not await self.wait_for_target_async(breaker):
+            return False
+        profile = self.profiler.begin(bind=False) if self.profiler is not None else None
+        
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire_async()
+        if profile is not None:
+            profile.mark('throttle')
+        
+        started_at = self.stats.request_started()
+        try:
+            if self.probe_mode == 'head':
+                async with http.head(url, allow_redirects=False, headers=headers,
+                                     trace_request_ctx=profile) as response:
+                    status = response.status
+                    content_length = self.header_content_length(response.headers)
+                if status not in (405, 501) and (
+                        not self.is_interesting(status, status_codes)
+                        or (content_length is not None and not self.needs_body(base_url, status))):
+                    return self.process_response(base_url, url, directory, status,
+                                                 content_length or 0, status_codes,
+                                                 headers=response.headers, cached=cached)
+            
+            async with http.get(url, allow_redirects=False, headers=headers,
+                                trace_request_ctx=profile) as response:
+                if profile is not None:
+                    profile.mark('wait')
+                content_length = None
+                if self.probe_mode != 'get':
+                    content_length = self.header_content_length(response.headers)
+                    if not self.is_interesting(response.status, status_codes):
+                        # Cuerpo pequeño: leerlo para conservar la conexión keep-alive
+                        if content_length is not None and content_length <= STREAM_DRAIN_LIMIT:
+                            await response.read()
+                        return self.process_response(base_url, url, directory, response.status,
+                                                     0, status_codes,
+                                                     headers=response.headers, cached=cached)
+                    if content_length is not None and not self.needs_body(base_url, response.status):
+                        return self.process_response(base_url, url, directory, response.status,
+                                                     content_length, status_codes,
+                                                     headers=response.headers, cached=cached)
+                body = await response.read()
+                if profile is not None:
+                    profile.mark('read')
+                if content_length is None:
+                    content_length = len(body)
+                return self.process_response(base_url, url, directory, response.status,
+                                             content_length, status_codes, body,
+                                             headers=response.headers, cached=cached)
+        
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self.stats.record_error()
+            # ClientSSLError es un ClientConnectionError: se separa antes
+            tls_error = self.tls_failure(e) if isinstance(e, aiohttp.ClientSSLError) else None
+            if tls_error is not None:
+                self.target_tls_failed(base_url, tls_error)
+                return PERMANENT_FAILURE
+            if isinstance(e, aiohttp.InvalidURL):
+                self.logger.debug(f"Request inválido para {url}: {e}")
+                return PERMANENT_FAILURE
+            if self.rate_limiter is not None and isinstance(e, asyncio.TimeoutError):
+                self.rate_limiter.on_overload()
+            if breaker is not None and isinstance(e, (aiohttp.ClientConnectionError, asyncio.TimeoutError)):
+                self.target_failed(breaker, base_url, started_at)
+            self.logger.debug(f"Error al verificar {url}: {e}")
+            return False
+        finally:
+            latency = self.stats.request_finished(started_at)
+            if self.rate_limiter is not None:
+                self.rate_limiter.on_complete(latency)
+            if profile is not None:
+                # Un carril por worker en la traza: cada corrutina es una tarea distinta
+                self.profiler.end(profile, url, lane=id(asyncio.current_task()))
+    
+    async def check_directory_h2(self, http, base_url, directory, status_codes=None):
+        """Verificar si un directorio existe (versión HTTP/2 con httpx)"""
+        if self.stop_scanning:
+            # False (en lugar de None) indica que la ruta no llegó a comprobarse
+            return False
+        
+        url = urljoin(base_url + '/', directory)
+        # --incremental: los negativos recientes no se vuelven a pedir y los aciertos
+        # se revalidan con un request condicional
+        cached = headers = None
+        if self.response_cache is not None:
+            skip, cached, headers = self.incremental_lookup(url, status_codes)
+            if skip:
+                return None
+        if self.tls_failures and self.host_abandoned(base_url):
+            return PERMANENT_FAILURE
+        breaker = self.circuit_breaker(base_url)
+        if breaker is not None and not await self.wait_for_target_async(breaker):
+            return False
+        profile = self.profiler.begin(bind=False) if self.profiler is not None else None
+        extensions = {'trace': self.profiler.httpcore_trace(profile)} if profile is not None else None
+        
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire_async()
+        if profile is not None:
+            profile.mark('throttle')
+        
+        started_at = self.stats.request_started()
+        try:
+            if self.probe_mode == 'head':
+                response = await http.head(url, headers=headers, extensions=extensions)
+                status = response.status_code
+                content_length = self.header_content_length(response.headers)
+                if status not in (405, 501) and (
+                        not self.is_interesting(status, status_codes)
+                        or (content_length is not None and not self.needs_body(base_url, status))):
+                    return self.process_response(base_url, url, directory, status,
+                                                 content_length or 0, status_codes,
+                                                 headers=response.headers, cached=cached)
+            
+            async with http.stream('GET', url, headers=headers, extensions=extensions) as response:
+                if profile is not None:
+                    profile.mark('wait')
+                content_length = None
+                if self.probe_mode != 'get':
+                    # En HTTP/2 cerrar el stream sin leer el cuerpo no cuesta la conexión
+                    content_length = self.header_content_length(response.headers)
+                    if not self.is_interesting(response.status_code, status_codes):
+                        return self.process_response(base_url, url, directory, response.status_code,
+                                                     0, status_codes,
+                                                     headers=response.headers, cached=cached)
+                    if content_length is not None and not self.needs_body(base_url, response.status_code):
+                        return self.process_response(base_url, url, directory, response.status_code,
+                                                     content_length, status_codes,
+                                                     headers=response.headers, cached=cached)
+                body = await response.aread()
+                if profile is not None:
+                    profile.mark('read')
+                if content_length is None:
+                    content_length = len(body)
+                return self.process_response(base_url, url, directory, response.status_code,
+                                             content_length, status_codes, body,
+                                             headers=response.headers, cached=cached)
+        
+        except httpx.HTTPError as e:
+            self.stats.record_error()
+            # httpx no tiene una excepción TLS propia: la causa es un ssl.SSLError
+            tls_error = self.tls_failure(e) if isinstance(e, httpx.ConnectError) else None
+            if tls_error is not None:
+                self.target_tls_failed(base_url, tls_error)
+                return PERMANENT_FAILURE
+            if isinstance(e, (httpx.UnsupportedProtocol, httpx.LocalProtocolError)):
+                self.logger.debug(f"Request inválido para {url}: {e}")
+                return PERMANENT_FAILURE
+            if self.rate_limiter is not None and isinstance(e, httpx.TimeoutException):
+                self.rate_limiter.on_overload()
+            if breaker is not None and isinstance(e, httpx.TransportError):
+                self.target_failed(breaker, base_url, started_at)
             self.logger.debug(f"Error al verificar {url}: {e}")
+            return False
+        finally:
+            latency = self.stats.request_finished(started_at)
+            if self.rate_limiter is not None:
+                self.rate_limiter.on_complete(latency)
+            if profile is not None:
+                self.profiler.end(profile, url, lane=id(asyncio.current_task()))
+    
+    def create_http2_client(self, concurrency, timeout=(DEFAULT_CONNECT_TIMEOUT, 10), verify_ssl=True):
+        """Cliente httpx con HTTP/2: los requests a un host se multiplexan en una conexión"""
+        # Contexto propio: el de requests lo modifica urllib3 durante la calibración
+        transport = CachedDNSTransport(self.create_ssl_context(verify_ssl), concurrency)
+        # Las cabeceras de conexión de HTTP/1.1 están prohibidas en HTTP/2
+        headers = {name: value for name, value in self.session.headers.items()
+                   if name.lower() not in ('connection', 'keep-alive')}
+        connect_timeout, read_timeout = timeout
+        return httpx.AsyncClient(transport=transport, headers=headers,
+                                 timeout=httpx.Timeout(read_timeout, connect=connect_timeout))
+    
+    def probe_directory(self, base_url, url, directory, status_codes=None, headers=None, cached=None):
+        """Sondear con HEAD o GET en streaming sin descargar cuerpos que no hacen falta"""
+        if self.probe_mode == 'head':
+            response = self.session.head(url, allow_redirects=False, headers=headers)
+            content_length = self.header_content_length(response.headers)
+            # Algunos servidores no implementan HEAD; en ese caso se repite con GET
+            if response.status_code not in (405, 501):
+                if not self.is_interesting(response.status_code, status_codes):
+                    return self.process_response(base_url, url, directory, response.status_code,
+                                                 0, status_codes,
+                                                 headers=response.headers, cached=cached)
+                if content_length is not None and not self.needs_body(base_url, response.status_code):
+                    return self.process_response(base_url, url, directory, response.status_code,
+                                                 content_length, status_codes,
+                                                 headers=response.headers, cached=cached)
+        
+        response = self.session.get(url, allow_redirects=False, stream=True, headers=headers)
+        try:
+            content_length = self.header_content_length(response.headers)
+            if not self.is_interesting(response.status_code, status_codes):
+                # Cuerpo pequeño: leerlo para conservar la conexión keep-alive
+                if content_length is not None and content_length <= STREAM_DRAIN_LIMIT:
+                    response.content
+                return self.process_response(base_url, url, directory, response.status_code,
+                                             0, status_codes,
+                                             headers=response.headers, cached=cached)
+            
+            # Solo se lee el cuerpo si falta Content-Length o si lo necesita el
+            # filtro de wildcard
+            if content_length is not None and not self.needs_body(base_url, response.status_code):
+                return self.process_response(base_url, url, directory, response.status_code,
+                                             content_length, status_codes,
+                                             headers=response.headers, cached=cached)
+            body = response.content
+            if content_length is None:
+                content_length = len(body)
+            return self.process_response(base_url, url, directory, response.status_code,
+                                         content_length, status_codes, body,
+                                         headers=response.headers, cached=cached)
+        finally:
+            response.close()
+    
+    def header_content_length(self, headers):
+        """Obtener Content-Length de las cabeceras, o None si no está disponible"""
+        value = headers.get('Content-Length')
+        if value is None or not value.strip().isdigit():
+            return None
+        return int(value)
+    
+    def is_interesting(self, status_code, status_codes=None):
+        """Comprobar si un código de estado está entre los de interés"""
+        if status_codes is None:
+            status_codes = DEFAULT_STATUS_CODES
+        return status_code in status_codes
+    
+    def needs_body(self, base_url, status_code):
+        """Indicar si el filtro de wildcard necesita el cuerpo para este código de estado"""
+        wildcard = self.wildcard_filters.get(base_url)
+        return wildcard is not None and status_code in wildcard.statuses
+    
+    def incremental_lookup(self, url, status_codes=None):
+        """Consultar la caché de respuestas: (omitir, entrada, cabeceras condicionales)"""
+        cached = self.response_cache.get(url)
+        if cached is not None and (cached['filtered'] or not self.is_interesting(cached['status'], status_codes)):
+            # Negativo confirmado hace menos de --cache-ttl: la ruta no se vuelve a pedir
+            self.stats.record_cached()
+            return True, cached, None
+        return False, cached, ResponseCache.conditional_headers(cached)
+    
+    def cache_response(self, url, status_code, content_length, headers=None, found=False, filtered=False):
+        """Guardar una respuesta en la caché incremental (salvo errores transitorios)"""
+        if self.response_cache is None or status_code >= 500 or status_code in OVERLOAD_STATUS_CODES:
+            return
+        self.response_cache.store(url, status_code, content_length, headers, found, filtered)
+    
+    def process_response(self, base_url, url, directory, status_code, content_length,
+                         status_codes=None, body=None, headers=None, cached=None):
+        """Aplicar el filtrado de códigos de estado y registrar el resultado
+        
+        Devuelve el resultado, None si la ruta no es de interés o False si la
+        respuesta es transitoria (429, 502, 503, 504) y hay que reintentarla.
+        Con --incremental, `cached` es la entrada con la que se hizo el request
+        condicional: un 304 equivale a la respuesta guardada.
+        """
+        if cached is not None and status_code == 304:
+            # Sin cambios desde el escaneo anterior
+            self.stats.record_revalidated()
+            status_code, content_length = cached['status'], cached['length']
+            headers = {'ETag': cached['etag'], 'Last-Modified': cached['last_modified']}
+        breaker = self.circuit_breaker(base_url)
+        if breaker is not None and breaker.record_success():
+            print(f"\n{Fore.GREEN}[+] {urlparse(base_url).netloc} vuelve a responder: se reanuda el "
+                  f"escaneo{Style.RESET_ALL}")
+        if self.rate_limiter is not None and status_code in OVERLOAD_STATUS_CODES:
+            self.rate_limiter.on_overload()
+        if status_code >= 500:
+            self.stats.record_server_error()
+        
+        # Verificar códigos de estado de interés
+        if self.is_interesting(status_code, status_codes):
+            # Descartar respuestas idénticas a las de rutas inexistentes
+            wildcard = self.wildcard_filters.get(base_url)
+            if wildcard is not None and body is not None and wildcard.matches(status_code, body, urlparse(url).path):
+                self.stats.record_filtered()
+                self.cache_response(url, status_code, content_length, headers, filtered=True)
+                return None
+            
+            self.stats.record_response(True)
+            result = {
+                'url': url,
+                'status_code': status_code,
+                'content_length': content_length,
+                'directory': directory
+            }
+            if self.multi_target:
+                result['host'] = urlparse(base_url).netloc
+            self.stats.add_result(result)
+            self.cache_response(url, status_code, content_length, headers, found=True)
+            return result
+        else:
+            self.stats.record_response(False)
+            self.cache_response(url, status_code, content_length, headers)
+            # Respuesta transitoria: False manda la ruta a la cola de reintentos
+            if status_code in RETRY_STATUS_CODES:
+                return False
             return None
     
-    def load_wordlist(self, wordlist_path):
-        """Cargar wordlist desde archivo"""
+    def calibrate_wildcard(self, base_url, status_codes=None, samples=3):
+        """Sondear rutas aleatorias inexistentes y guardar la huella de la respuesta base"""
+        wildcard = WildcardFilter()
+        for i in range(samples):
+            name = uuid.uuid4().hex
+            # Variar la forma de la ruta: sin barra, con barra final y con extensión
+            directory = [name, name + '/', name + '.html'][i % 3]
+            url = urljoin(base_url + '/', directory)
+            try:
+                response = self.session.get(url, allow_redirects=False)
+            except requests.exceptions.RequestException as e:
+                self.logger.debug(f"Error en calibración {url}: {e}")
+                continue
+            if self.is_interesting(response.status_code, status_codes):
+                # Ruta completa: los subdirectorios heredan esta huella en modo recursivo
+                wildcard.add(response.status_code, response.content, urlparse(url).path)
+        
+        if wildcard.statuses:
+            self.wildcard_filters[base_url] = wildcard
+            print(f"{Fore.YELLOW}[!] Respuestas wildcard detectadas en {base_url} "
+                  f"(códigos {sorted(wildcard.statuses)}); se filtrarán{Style.RESET_ALL}")
+        return wildcard
+    
+    def load_wordlist(self, wordlist_path, dedup=False):
+        """Cargar wordlist desde archivo (de forma perezosa, sin leerla entera en memoria)"""
         try:
-            with open(wordlist_path, 'r', encoding='utf-8') as f:
-                return [line.strip() for line in f if line.strip() and not line.startswith('#')]
+            if CompiledWordlist.is_compiled(wordlist_path):
+                # Precompilada: ya filtrada y sin duplicados, se abre sin leerla
+                wordlist = CompiledWordlist(wordlist_path)
+            else:
+                wordlist = Wordlist(wordlist_path, dedup=dedup)
+            if len(wordlist) == 0:
+                self.logger.error(f"La wordlist está vacía: {wordlist_path}")
+                return []
+            return wordlist
         except FileNotFoundError:
             self.logger.error(f"Archivo de wordlist no encontrado: {wordlist_path}")
             return []
@@ -198,31 +2907,120 @@ class DirForcerPro:
         
         print("")
     
-    def print_progress(self, current, total):
-        """Mostrar barra de progreso"""
-        percentage = (current / total) * 100
-        bar_length = 50
-        filled_length = int(bar_length * current // total)
+    def print_progress(self, current, total, final=False):
+        """Mostrar la línea de estado: progreso, req/s, en vuelo, errores, ETA y latencias"""
+        # En un worker de --processes el progreso lo muestra el proceso principal
+        if self.shard_link is not None:
+            self.shard_link.maybe_flush(self.stats)
+            return
+        
+        # Se llama en cada lote de completados: refrescar como mucho cada STATUS_INTERVAL
+        now = time.monotonic()
+        if not final and now - self.last_status < STATUS_INTERVAL:
+            return
+        self.last_status = now
+        
+        # Requests/segundo sobre una ventana deslizante de completados
+        samples = self.throughput_samples
+        if samples and current < samples[-1][1]:
+            samples.clear()
+        samples.append((now, current))
+        while len(samples) > 2 and now - samples[1][0] >= THROUGHPUT_WINDOW:
+            samples.popleft()
+        elapsed = now - samples[0][0]
+        rate = (current - samples[0][1]) / elapsed if elapsed > 0 else 0.0
+        
+        # El total de la wordlist es una cota superior (comentarios, duplicados)
+        current = min(current, total)
+        percentage = (current / total) * 100 if total else 100.0
+        bar_length = 30
+        filled_length = int(bar_length * current // total) if total else bar_length
         bar = '█' * filled_length + '-' * (bar_length - filled_length)
         
-        print(f"\r{Fore.CYAN}Progreso: [{bar}] {percentage:.1f}% ({current}/{total}){Style.RESET_ALL}", end='')
+        finished = self.stats.completed_requests
+        error_rate = self.stats.error_requests / finished * 100 if finished else 0.0
+        if rate > 0:
+            eta = int((total - current) / rate)
+            eta_text = f"{eta // 3600:02d}:{eta % 3600 // 60:02d}:{eta % 60:02d}"
+        else:
+            eta_text = '--:--:--'
+        histogram = self.stats.histogram()
+        
+        print(f"\r{Fore.CYAN}[{bar}] {percentage:.1f}% ({current}/{total}) | {rate:.0f} req/s | "
+              f"en vuelo: {self.stats.in_flight} | errores: {error_rate:.1f}% | "
+              f"p50 {histogram.percentile(50):.1f} ms p99 {histogram.percentile(99):.1f} ms | "
+              f"ETA {eta_text}{Style.RESET_ALL}\033[K", end='')
         sys.stdout.flush()
     
     def print_results(self, results, output_file=None):
         """Mostrar resultados del escaneo"""
         print(f"\n\n{Fore.GREEN}=== RESULTADOS DEL ESCANEO ==={Style.RESET_ALL}")
-        print(f"{Fore.CYAN}Total de directorios encontrados: {len(results)}{Style.RESET_ALL}")
+        total_found = self.result_sink.written if self.result_sink is not None else len(results)
+        print(f"{Fore.CYAN}Total de directorios encontrados: {total_found}{Style.RESET_ALL}")
         print(f"{Fore.CYAN}Total de requests: {self.total_requests}{Style.RESET_ALL}")
         print(f"{Fore.CYAN}Requests exitosos: {self.successful_requests}{Style.RESET_ALL}")
         print(f"{Fore.CYAN}Requests fallidos: {self.failed_requests}{Style.RESET_ALL}")
+        if self.wildcard_filters:
+            print(f"{Fore.CYAN}Respuestas wildcard filtradas: {self.stats.filtered_requests}{Style.RESET_ALL}")
+        if self.stats.retried_requests:
+            print(f"{Fore.CYAN}Rutas reintentadas tras errores de conexión: {self.stats.retried_requests}{Style.RESET_ALL}")
+        trips = sum(breaker.trips for breaker in self.breakers.values())
+        if trips:
+            print(f"{Fore.CYAN}Pausas del cortacircuitos: {trips}{Style.RESET_ALL}")
+        if self.response_cache is not None:
+            print(f"{Fore.CYAN}Caché incremental: {self.stats.cached_requests} rutas omitidas, "
+                  f"{self.stats.revalidated_requests} revalidadas sin cambios (304){Style.RESET_ALL}")
         
         if self.start_time:
             elapsed_time = time.time() - self.start_time
             print(f"{Fore.CYAN}Tiempo total: {elapsed_time:.2f} segundos{Style.RESET_ALL}")
+            print(f"{Fore.CYAN}Requests por segundo: {self.stats.requests_per_second(elapsed_time):.1f}{Style.RESET_ALL}")
+        if self.rate_limiter is not None and self.rate_limiter.adaptive:
+            print(f"{Fore.CYAN}Tasa final (AIMD): {self.rate_limiter.rate:.1f} req/s{Style.RESET_ALL}")
+        
+        latencies = self.stats.latency_percentiles()
+        print(f"{Fore.CYAN}Latencia (ms): " + ", ".join(f"{k}={v}" for k, v in latencies.items()) + Style.RESET_ALL)
+        if DNS_CACHE.lookups or DNS_CACHE.pinned:
+            print(f"{Fore.CYAN}Caché DNS: {DNS_CACHE.lookups} resoluciones, {DNS_CACHE.hits} aciertos"
+                  f"{f', {len(DNS_CACHE.pinned)} hosts fijados' if DNS_CACHE.pinned else ''}{Style.RESET_ALL}")
+        if self.profiler is not None:
+            self.print_profile()
+        
+        # En streaming los resultados ya están en disco
+        if self.result_sink is not None:
+            print(f"\n{Fore.GREEN}Resultados transmitidos a: {self.result_sink.path}{Style.RESET_ALL}")
+            return
         
         print(f"\n{Fore.GREEN}Directorios encontrados:{Style.RESET_ALL}")
         
-        # Agrupar por código de estado
+        # Con varios objetivos, agrupar primero por host
+        if self.multi_target:
+            for host, host_results in self.group_by_host(results).items():
+                print(f"\n{Fore.BLUE}=== {host} ({len(host_results)} directorios) ==={Style.RESET_ALL}")
+                self.print_status_groups(host_results)
+        else:
+            self.print_status_groups(results)
+        
+        # Guardar resultados en archivo si se especifica
+        if output_file:
+            self.save_results(results, output_file)
+    
+    def print_profile(self):
+        """Mostrar el reparto del tiempo de los requests por fase (--profile)"""
+        summary = self.profiler.summary()
+        print(f"\n{Fore.GREEN}Perfil por fase ({summary['total']['count']} requests):{Style.RESET_ALL}")
+        print(f"  {'fase':<10} {'total (s)':>10} {'%':>7} {'p50 (ms)':>10} {'p99 (ms)':>10} {'n':>9}")
+        for phase in ScanProfiler.PHASES:
+            values = summary[phase]
+            if not values['count']:
+                continue
+            print(f"  {phase:<10} {values['seconds']:>10.3f} {values['percent']:>6.1f}% "
+                  f"{values['p50_ms']:>10.3f} {values['p99_ms']:>10.3f} {values['count']:>9}")
+        if self.profiler.truncated:
+            print(f"{Fore.YELLOW}[!] Traza truncada a {ScanProfiler.MAX_TRACE_EVENTS} eventos{Style.RESET_ALL}")
+    
+    def print_status_groups(self, results):
+        """Mostrar resultados agrupados por código de estado"""
         status_groups = {}
         for result in results:
             status = result['status_code']
@@ -236,13 +3034,18 @@ class DirForcerPro:
             
             for result in status_groups[status_code]:
                 print(f"  {result['url']} ({result['content_length']} bytes)")
-        
-        # Guardar resultados en archivo si se especifica
-        if output_file:
-            self.save_results(results, output_file)
+    
+    def group_by_host(self, results):
+        """Agrupar resultados por host, ordenados alfabéticamente"""
+        hosts = {}
+        for result in results:
+            host = result.get('host') or urlparse(result['url']).netloc
+            hosts.setdefault(host, []).append(result)
+        return dict(sorted(hosts.items()))
     
     def save_results(self, results, output_file):
         """Guardar resultados en archivo"""
+        elapsed_time = time.time() - self.start_time if self.start_time else 0
         try:
             with open(output_file, 'w', encoding='utf-8') as f:
                 json.dump({
@@ -251,74 +3054,943 @@ class DirForcerPro:
                     'total_requests': self.total_requests,
                     'successful_requests': self.successful_requests,
                     'failed_requests': self.failed_requests,
-                    'results': results
+                    'wildcard_filtered': self.stats.filtered_requests,
+                    **({'incremental': {'skipped': self.stats.cached_requests,
+                                        'revalidated': self.stats.revalidated_requests}}
+                       if self.response_cache is not None else {}),
+                    'requests_per_second': round(self.stats.requests_per_second(elapsed_time), 2),
+                    'latency_ms': self.stats.latency_percentiles(),
+                    'latency_histogram': self.stats.histogram().to_dict(),
+                    **({'profile': self.profiler.summary()} if self.profiler is not None else {}),
+                    'results': results,
+                    # Cada resultado ya lleva su 'host': aquí solo el recuento, sin repetirlos
+                    **({'hosts': {host: len(host_results) for host, host_results
+                                  in self.group_by_host(results).items()}}
+                       if self.multi_target else {})
                 }, f, indent=2)
             print(f"\n{Fore.GREEN}Resultados guardados en: {output_file}{Style.RESET_ALL}")
         except Exception as e:
             self.logger.error(f"Error al guardar resultados: {e}")
     
     def scan(self, target_url, wordlist_path, **kwargs):
-        """Realizar escaneo de directorios"""
-        # Validar URL
-        target_url = self.validate_url(target_url)
-        if not target_url:
+        """Realizar escaneo de directorios (target_url puede ser una lista de objetivos)"""
+        # Validar URL(s)
+        targets = []
+        for url in target_url if isinstance(target_url, (list, tuple)) else [target_url]:
+            valid = self.validate_url(url)
+            if valid and valid not in targets:
+                targets.append(valid)
+        if not targets:
             return False
+        target_url = targets[0]
+        self.multi_target = len(targets) > 1
         
         # Cargar wordlist
-        directories = self.load_wordlist(wordlist_path)
+        directories = self.load_wordlist(wordlist_path, dedup=kwargs.get('dedup', False))
         if not directories:
             return False
         
-        # Configurar sesión
+        # Estadísticas de aciertos entre escaneos (opcionales): se actualizan con cada hallazgo.
+        # --prioritize sin --hit-stats usa el almacén por defecto; --no-hit-stats pasa False
+        hit_stats = kwargs.get('hit_stats')
+        if hit_stats is None and kwargs.get('prioritize'):
+            hit_stats = DEFAULT_HIT_STATS
+        if hit_stats:
+            self.hit_stats = HitStatistics(hit_stats).load()
+        if kwargs.get('prioritize'):
+            if self.hit_stats is None:
+                self.logger.error("--prioritize necesita las estadísticas de aciertos (quita --no-hit-stats)")
+                return False
+            # Las entradas con más aciertos previos van primero
+            directories = PrioritizedWordlist(directories, self.hit_stats.rank(directories))
+        
+        # Extensiones y mutaciones: se expanden al vuelo durante el escaneo
+        if kwargs.get('extensions') or kwargs.get('patterns') or kwargs.get('mutations'):
+            directories = WordlistExpansion(directories, kwargs.get('extensions') or (),
+                                            kwargs.get('patterns'), kwargs.get('mutations') or ())
+            if not directories.templates:
+                self.logger.error("Las plantillas con {ext} necesitan extensiones (-x)")
+                return False
+        
+        # Configurar parámetros
+        max_workers = kwargs.get('threads', 10)
+        # Con varios objetivos, ningún host acapara todo el pool de workers
+        per_host_limit = kwargs.get('per_host_limit') or (min(max_workers, 10) if self.multi_target else max_workers)
+        
+        # --profile: el perfilador debe existir antes de montar los adaptadores de la sesión
+        if kwargs.get('profile') or kwargs.get('profile_output'):
+            self.profiler = ScanProfiler(kwargs.get('profile_output'))
+        
+        # Configurar sesión: un pool de conexiones por host
         self.setup_session(
             user_agent=kwargs.get('user_agent'),
             timeout=kwargs.get('timeout', 10),
-            verify_ssl=kwargs.get('verify_ssl', True)
+            verify_ssl=kwargs.get('verify_ssl', True),
+            pool_size=kwargs.get('pool_size') or per_host_limit,
+            keep_alive=kwargs.get('keep_alive', True),
+            tls_session_reuse=kwargs.get('tls_session_reuse', False),
+            hosts=len(targets),
+            resolve=kwargs.get('resolve'),
+            dns_ttl=kwargs.get('dns_ttl'),
+            connect_timeout=kwargs.get('connect_timeout')
         )
         
-        # Configurar parámetros
-        max_workers = kwargs.get('threads', 10)
         delay = kwargs.get('delay', 0)
-        status_codes = kwargs.get('status_codes', [200, 301, 302, 403, 401])
+        rate = kwargs.get('rate')
+        
+        # --delay se traduce a una tasa global equivalente (1 request cada `delay` segundos)
+        if not rate and delay > 0:
+            rate = 1.0 / delay
+        if kwargs.get('adaptive') and not rate:
+            rate = max_workers * 10
+        if rate:
+            self.rate_limiter = RateLimiter(
+                rate,
+                adaptive=kwargs.get('adaptive', False),
+                max_rate=kwargs.get('max_rate') or 10000.0
+            )
+        self.setup_circuit_breaker(kwargs.get('breaker_threshold', DEFAULT_BREAKER_THRESHOLD),
+                                   kwargs.get('abort_after', DEFAULT_ABORT_AFTER))
+        status_codes = kwargs.get('status_codes', DEFAULT_STATUS_CODES)
+        self.http2 = kwargs.get('http2', False)
+        # HTTP/2 usa el motor asíncrono con httpx en lugar de aiohttp
+        engine = 'async' if self.http2 else kwargs.get('engine', 'threads')
+        self.probe_mode = kwargs.get('probe', 'get')
         
-        print(f"{Fore.BLUE}Objetivo: {target_url}{Style.RESET_ALL}")
-        print(f"{Fore.BLUE}Wordlist: {wordlist_path} ({len(directories)} entradas){Style.RESET_ALL}")
+        if not self.engine_available(engine):
+            return False
+        
+        # Caché de respuestas entre escaneos (--incremental)
+        if kwargs.get('incremental'):
+            try:
+                self.response_cache = ResponseCache(
+                    kwargs.get('response_cache') or DEFAULT_RESPONSE_CACHE,
+                    ttl=kwargs.get('cache_ttl') or DEFAULT_CACHE_TTL,
+                    max_entries=kwargs.get('cache_size') or DEFAULT_CACHE_SIZE
+                ).open()
+            except sqlite3.Error as e:
+                self.logger.error(f"No se pudo abrir la caché de respuestas: {e}")
+                return False
+        
+        if self.multi_target:
+            print(f"{Fore.BLUE}Objetivos: {len(targets)} hosts (máximo {per_host_limit} requests "
+                  f"simultáneos por host){Style.RESET_ALL}")
+        else:
+            print(f"{Fore.BLUE}Objetivo: {target_url}{Style.RESET_ALL}")
+        if isinstance(directories, WordlistExpansion):
+            print(f"{Fore.BLUE}Wordlist: {wordlist_path} ({len(directories.wordlist)} entradas, hasta "
+                  f"{directories.per_word} variantes por entrada: {len(directories)} en total){Style.RESET_ALL}")
+        else:
+            print(f"{Fore.BLUE}Wordlist: {wordlist_path} ({len(directories)} entradas){Style.RESET_ALL}")
+        if kwargs.get('prioritize'):
+            priority = self.base_wordlist(directories).priority
+            print(f"{Fore.BLUE}Priorizadas: {len(priority)} entradas con aciertos en escaneos anteriores "
+                  f"({self.hit_stats.path}){Style.RESET_ALL}")
+        if self.response_cache is not None:
+            print(f"{Fore.BLUE}Incremental: {len(self.response_cache)} respuestas en caché "
+                  f"({self.response_cache.path}, vigencia {self.response_cache.ttl / 3600:.0f} h){Style.RESET_ALL}")
+        if kwargs.get('max_requests'):
+            print(f"{Fore.BLUE}Presupuesto: {kwargs['max_requests']} requests{Style.RESET_ALL}")
+        print(f"{Fore.BLUE}Motor: {engine}{' (HTTP/2)' if self.http2 else ''}{Style.RESET_ALL}")
         print(f"{Fore.BLUE}Threads: {max_workers}{Style.RESET_ALL}")
-        print(f"{Fore.BLUE}Delay: {delay} segundos{Style.RESET_ALL}")
+        processes = kwargs.get('processes') or 1
+        if processes > 1:
+            print(f"{Fore.BLUE}Procesos: {processes} (la wordlist se reparte entre ellos){Style.RESET_ALL}")
+        print(f"{Fore.BLUE}Modo de sondeo: {self.probe_mode}{Style.RESET_ALL}")
+        print(f"{Fore.BLUE}Pool de conexiones: {self.pool_settings['pool_maxsize']} por host, "
+              f"keep-alive: {'sí' if self.pool_settings['keep_alive'] else 'no'}, "
+              f"reanudación de sesión TLS: "
+              f"{'sí (TLS 1.2 como máximo)' if self.pool_settings['tls_session_reuse'] else 'no'}{Style.RESET_ALL}")
+        print(f"{Fore.BLUE}Timeouts: conexión {self.timeouts[0]:g}s, lectura {self.timeouts[1]:g}s{Style.RESET_ALL}")
+        if kwargs.get('retries', DEFAULT_RETRIES):
+            print(f"{Fore.BLUE}Reintentos: hasta {kwargs.get('retries', DEFAULT_RETRIES)} por ruta (cola de "
+                  f"{kwargs.get('retry_queue_size') or DEFAULT_RETRY_QUEUE_SIZE}, "
+                  f"{kwargs.get('retry_concurrency') or DEFAULT_RETRY_CONCURRENCY} a la vez){Style.RESET_ALL}")
+        if kwargs.get('recursive'):
+            print(f"{Fore.BLUE}Recursivo: sí (profundidad máxima {kwargs.get('max_depth', 2)}){Style.RESET_ALL}")
+        if self.rate_limiter is not None:
+            mode = 'adaptativa (AIMD)' if self.rate_limiter.adaptive else 'fija'
+            print(f"{Fore.BLUE}Tasa: {self.rate_limiter.rate:.1f} req/s, {mode}{Style.RESET_ALL}")
+        else:
+            print(f"{Fore.BLUE}Tasa: sin límite{Style.RESET_ALL}")
+        if self.breaker_settings is not None:
+            print(f"{Fore.BLUE}Cortacircuitos: pausa tras {self.breaker_settings['threshold']} errores de "
+                  f"conexión seguidos, abandono tras {self.breaker_settings['abort_after']:.0f}s caído{Style.RESET_ALL}")
+        if self.profiler is not None:
+            print(f"{Fore.BLUE}Perfilado: tiempos por fase"
+                  f"{f', salida en {self.profiler.output}' if self.profiler.output else ''}{Style.RESET_ALL}")
         print(f"{Fore.BLUE}Códigos de estado de interés: {status_codes}{Style.RESET_ALL}\n")
         
+        # Calibración: huella de las respuestas a rutas inexistentes
+        if kwargs.get('calibrate', True):
+            if self.multi_target:
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    list(executor.map(lambda url: self.calibrate_wildcard(url, status_codes), targets))
+            else:
+                self.calibrate_wildcard(target_url, status_codes)
+        
         self.start_time = time.time()
         
-        # Realizar escaneo con threads
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = []
+        # Frontera de escaneo: el objetivo a profundidad 0 y, en modo recursivo,
+        # cada directorio descubierto hasta --max-depth
+        max_depth = kwargs.get('max_depth', 2) if kwargs.get('recursive') else 0
+        # Los objetivos se recorren intercalados (host, entrada) para repartir la carga
+        frontier = ScanFrontier(directories, max_depth,
+                                interleave=min(len(targets), MAX_INTERLEAVED_DIRECTORIES),
+                                per_host_limit=per_host_limit)
+        frontier.max_jobs = kwargs.get('max_requests')
+        frontier.max_retries = kwargs.get('retries', DEFAULT_RETRIES)
+        frontier.retry_limit = kwargs.get('retry_queue_size') or DEFAULT_RETRY_QUEUE_SIZE
+        frontier.retry_concurrency = kwargs.get('retry_concurrency') or DEFAULT_RETRY_CONCURRENCY
+        for url in targets:
+            frontier.add(url, 0)
+        
+        # Salida en streaming (JSON Lines / CSV)
+        output_file = kwargs.get('output_file')
+        output_format = kwargs.get('output_format') or self.infer_output_format(output_file)
+        if output_file and output_format in RESULT_SINKS:
+            sink_options = {'append': kwargs.get('resume', False)}
+            if output_format == 'csv' and self.multi_target:
+                sink_options['fields'] = CsvSink.FIELDS + ['host']
+            self.result_sink = RESULT_SINKS[output_format](output_file, **sink_options)
+            self.stats.keep_results = False
+            print(f"{Fore.BLUE}Salida en streaming ({output_format}): {output_file}{Style.RESET_ALL}")
+        
+        # Diario de checkpoint para poder reanudar el escaneo
+        checkpoint = kwargs.get('checkpoint') or (DEFAULT_CHECKPOINT if kwargs.get('resume') else None)
+        if checkpoint:
+            if not self.setup_checkpoint(checkpoint, frontier, targets, wordlist_path,
+                                         kwargs.get('resume', False)):
+                if self.result_sink is not None:
+                    self.result_sink.close()
+                return False
+        
+        if self.profiler is not None:
+            self.profiler.start()
+        try:
+            if kwargs.get('coordinator'):
+                self.run_coordinator(frontier, status_codes, kwargs['coordinator'],
+                                     chunk_size=kwargs.get('chunk_size') or 500,
+                                     lease_timeout=kwargs.get('lease_timeout') or 60.0,
+                                     token=kwargs.get('token'))
+            elif processes > 1:
+                self.scan_processes(frontier, wordlist_path, processes, {
+                    'user_agent': kwargs.get('user_agent'),
+                    'timeout': kwargs.get('timeout', 10),
+                    'verify_ssl': kwargs.get('verify_ssl', True),
+                    'pool_size': kwargs.get('pool_size'),
+                    'keep_alive': kwargs.get('keep_alive', True),
+                    'tls_session_reuse': kwargs.get('tls_session_reuse', False),
+                    'hosts': len(targets),
+                    'resolve': kwargs.get('resolve'),
+                    'dns_ttl': kwargs.get('dns_ttl'),
+                    'connect_timeout': kwargs.get('connect_timeout'),
+                    'breaker_settings': self.breaker_settings,
+                    'threads': max_workers,
+                    'per_host_limit': per_host_limit,
+                    'window': kwargs.get('window'),
+                    'engine': engine,
+                    'http2': self.http2,
+                    'status_codes': status_codes,
+                    'dedup': kwargs.get('dedup', False)
+                })
+            elif engine == 'async':
+                asyncio.run(self.scan_async(
+                    frontier,
+                    status_codes,
+                    max_workers,
+                    per_host_limit,
+                    self.timeouts,
+                    kwargs.get('verify_ssl', True)
+                ))
+            else:
+                self.scan_threads(frontier, status_codes, max_workers,
+                                  kwargs.get('window') or max_workers * 4)
+        finally:
+            if self.profiler is not None:
+                self.profiler.stop()
+            if self.hit_stats is not None:
+                try:
+                    self.hit_stats.save()
+                except OSError as e:
+                    self.logger.error(f"Error al guardar las estadísticas de aciertos: {e}")
+            if self.response_cache is not None:
+                try:
+                    self.response_cache.close()
+                except sqlite3.Error as e:
+                    self.logger.error(f"Error al guardar la caché de respuestas: {e}")
+            if self.journal is not None:
+                self.journal.close()
+            if self.result_sink is not None:
+                self.result_sink.close()
+        
+        self.print_progress(self.stats.completed_requests, frontier.total_jobs, final=True)
+        if self.profiler is not None and self.profiler.output:
+            try:
+                self.profiler.dump()
+                print(f"\n{Fore.GREEN}Perfil guardado en: {self.profiler.output}{Style.RESET_ALL}")
+            except OSError as e:
+                self.logger.error(f"Error al guardar el perfil: {e}")
+        return True
+    
+    def base_wordlist(self, wordlist):
+        """Wordlist sin la expansión de extensiones y mutaciones"""
+        return wordlist.wordlist if isinstance(wordlist, WordlistExpansion) else wordlist
+    
+    def engine_available(self, engine):
+        """Comprobar que están instaladas las dependencias opcionales del motor"""
+        if self.http2 and httpx is None:
+            self.logger.error("--http2 requiere httpx con soporte HTTP/2 (pip install 'httpx[http2]')")
+            return False
+        if engine == 'async' and not self.http2 and aiohttp is None:
+            self.logger.error("El motor asíncrono requiere aiohttp (pip install aiohttp)")
+            return False
+        return True
+    
+    def infer_output_format(self, output_file):
+        """Deducir el formato de salida a partir de la extensión del archivo"""
+        if not output_file:
+            return 'json'
+        extension = os.path.splitext(output_file)[1].lower()
+        if extension in ('.jsonl', '.ndjson'):
+            return 'jsonl'
+        if extension == '.csv':
+            return 'csv'
+        return 'json'
+    
+    def setup_checkpoint(self, checkpoint, frontier, targets, wordlist_path, resume=False):
+        """Abrir el diario de checkpoint y, si se reanuda, restaurar su estado"""
+        self.journal = CheckpointJournal(checkpoint)
+        header = {'target': targets[0] if len(targets) == 1 else targets,
+                  'wordlist': os.path.abspath(wordlist_path)}
+        # Los offsets dependen de la expansión: reanudar con otra daría rutas distintas
+        if isinstance(frontier.wordlist, WordlistExpansion):
+            header['expansion'] = frontier.wordlist.config()
+        # El orden de --prioritize cambia con cada escaneo: se reanuda con el del checkpoint
+        prioritized = self.base_wordlist(frontier.wordlist)
+        if isinstance(prioritized, PrioritizedWordlist):
+            header['priority'] = prioritized.priority
+        
+        if resume and os.path.exists(checkpoint):
+            state = self.journal.load()
+            previous = state['header'] or {}
+            if isinstance(prioritized, PrioritizedWordlist) and 'priority' in previous:
+                prioritized.priority = header['priority'] = previous['priority']
+            if (previous.get('target') != header['target'] or previous.get('wordlist') != header['wordlist']
+                    or previous.get('expansion') != header.get('expansion')
+                    or previous.get('priority') != header.get('priority')):
+                self.logger.error(f"El checkpoint {checkpoint} corresponde a otro objetivo, wordlist o expansión")
+                self.journal = None
+                return False
             
-            for i, directory in enumerate(directories):
-                if self.stop_scanning:
-                    break
+            targets_by_host = {urlparse(url).netloc: url for url in targets}
+            for base_url, depth in state['directories']:
+                frontier.add(base_url, depth)
+                # Los subdirectorios heredan la huella de wildcard de su objetivo
+                target_url = targets_by_host.get(urlparse(base_url).netloc)
+                if target_url in self.wildcard_filters:
+                    self.wildcard_filters.setdefault(base_url, self.wildcard_filters[target_url])
+            frontier.resume_state = state['progress']
+            # En streaming no se guardan: ya están en el archivo de salida
+            for result in state['results']:
+                self.stats.add_result(result)
+            
+            done = sum(offset + len(extra) for offset, extra in state['progress'].values())
+            print(f"{Fore.YELLOW}[!] Reanudando desde {checkpoint}: {done} entradas ya completadas, "
+                  f"{len(state['results'])} resultados previos{Style.RESET_ALL}")
+            self.journal.open()
+        else:
+            if os.path.exists(checkpoint):
+                os.remove(checkpoint)
+            self.journal.open(header)
+            for target_url in targets:
+                self.journal.record_directory(target_url, 0)
+        return True
+    
+    def scan_threads(self, frontier, status_codes, max_workers, window):
+        """Motor de escaneo con ThreadPoolExecutor y una ventana acotada de trabajos"""
+        # Solo se encola trabajo nuevo cuando termina el anterior, así la memoria
+        # no crece con el tamaño de la wordlist
+        completed = 0
+        pending = {}
+        
+        # Con --profile y salida pstats, cada thread del pool lleva su propio cProfile
+        initializer = self.profiler.profile_thread if self.profiler is not None else None
+        with ThreadPoolExecutor(max_workers=max_workers, initializer=initializer) as executor:
+            while not self.stop_scanning:
+                self.poll_shard_work(frontier)
+                # Rellenar la ventana con trabajos de la frontera (de cualquier profundidad)
+                while len(pending) < window:
+                    job = frontier.next_job()
+                    if job is None:
+                        break
+                    base_url, directory, depth, offset, word = job
+                    future = executor.submit(
+                        self.check_directory, 
+                        base_url, 
+                        directory, 
+                        status_codes
+                    )
+                    pending[future] = job
+                
+                # Sin trabajos en vuelo ni pendientes: escaneo terminado
+                # (salvo reintentos a la espera de su hora o que otro proceso de
+                # --processes descubra más directorios)
+                if not pending:
+                    delay = frontier.retry_delay()
+                    if delay is not None:
+                        time.sleep(delay)
+                        continue
+                    if self.shard_link is None or not self.wait_shard_work(frontier):
+                        break
+                    continue
+                
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                completed = self.collect_futures(done, pending, frontier, completed)
+            
+            # Interrupción: descartar lo que aún no ha empezado
+            for future in pending:
+                future.cancel()
+            
+            # Esperar los resultados que quedan en vuelo
+            self.collect_futures(list(pending), pending, frontier, completed)
+    
+    def collect_futures(self, futures, pending, frontier, completed):
+        """Procesar futures terminados: mostrar hallazgos, ampliar la frontera y el progreso"""
+        for future in as_completed(futures):
+            job = pending.pop(future)
+            frontier.job_done(job)
+            completed += 1
+            if future.cancelled():
+                continue
+            try:
+                result = future.result()
+            except Exception as e:
+                self.stats.record_error()
+                self.logger.debug(f"Error inesperado en {job[0]}/{job[1]}: {e}")
+                result = False
+            self.complete_job(job, result, frontier)
+            
+            # La línea de estado avanza con los completados (print_progress limita el refresco)
+            self.print_progress(completed, frontier.total_jobs)
+        return completed
+    
+    def complete_job(self, job, result, frontier):
+        """Procesar el resultado de un trabajo terminado y anotarlo en el checkpoint"""
+        base_url, directory, depth, offset, word = job
+        if result is PERMANENT_FAILURE:
+            # Reintentar no cambiaría nada; tampoco se da por comprobada (--resume la repite)
+            frontier.attempts.pop(job, None)
+            return
+        if result:
+            self.handle_found(result, base_url, depth, frontier, word)
+        if result is False:
+            # Error de conexión o respuesta transitoria: la ruta se reintenta al final,
+            # salvo que se abandone el escaneo o el host
+            if not self.stop_scanning and not self.host_abandoned(base_url) and frontier.retry(job):
+                self.stats.record_retry()
+                return
+        # Trabajo terminado (comprobado o sin más reintentos): olvidar sus intentos
+        frontier.attempts.pop(job, None)
+        if result is False:
+            return
+        # Solo se da por completada una ruta realmente comprobada. Tras detener el escaneo
+        # se anota igualmente si su hallazgo ya se emitió, para no repetirlo al reanudar
+        if self.stop_scanning and not result:
+            return
+        if self.journal is not None:
+            self.journal.record_completed(base_url, offset)
+        elif self.shard_link is not None and self.shard_link.track_completed:
+            self.shard_link.send('completed', base_url, offset)
+    
+    def apply_shard_commands(self, frontier, commands):
+        """Aplicar las órdenes del proceso principal; False si hay que parar"""
+        for command in commands:
+            if command[0] == 'stop':
+                self.stop_scanning = True
+                return False
+            _, url, depth, parent = command
+            self.shard_link.received += 1
+            frontier.add(url, depth)
+            if parent in self.wildcard_filters:
+                self.wildcard_filters[url] = self.wildcard_filters[parent]
+        return True
+    
+    def poll_shard_work(self, frontier):
+        """Recoger sin bloquear los directorios descubiertos por otros procesos"""
+        if self.shard_link is not None:
+            self.apply_shard_commands(frontier, self.shard_link.poll())
+    
+    def wait_shard_work(self, frontier):
+        """Worker ocioso: esperar más directorios (True) o la orden de parar (False)"""
+        return self.apply_shard_commands(frontier, self.shard_link.wait(self.stats))
+    
+    def handle_found(self, result, base_url, depth, frontier, word=None):
+        """Mostrar un hallazgo y, en modo recursivo, encolar el directorio descubierto
+        
+        `word` es la entrada de la wordlist de la que sale la ruta (sin la expansión
+        de -x/--pattern/--mutate). Devuelve la URL del directorio encolado, o None.
+        """
+        # Un worker de --processes delega todo en el proceso principal
+        if self.shard_link is not None:
+            self.shard_link.send('result', result, base_url, depth, word)
+            return None
+        self.print_found(result)
+        if self.hit_stats is not None:
+            self.hit_stats.record(word or result['directory'])
+        if self.result_sink is not None:
+            self.result_sink.write(result)
+        if self.journal is not None:
+            self.journal.record_result(result)
+        if result['status_code'] in RECURSE_STATUS_CODES and self.looks_like_directory(result['directory']):
+            child = result['url'].rstrip('/')
+            if frontier.add(child, depth + 1):
+                if self.journal is not None:
+                    self.journal.record_directory(child, depth + 1)
+                # El directorio hereda la huella de wildcard de su padre
+                if base_url in self.wildcard_filters:
+                    self.wildcard_filters[child] = self.wildcard_filters[base_url]
+                print(f"\n{Fore.BLUE}[>] Directorio encolado para escaneo recursivo: {child}/ "
+                      f"(profundidad {depth + 1}){Style.RESET_ALL}")
+                return child
+        return None
+    
+    def looks_like_directory(self, directory):
+        """Descartar entradas con aspecto de archivo (robots.txt, index.php...)"""
+        name = directory.rstrip('/').rsplit('/', 1)[-1]
+        return directory.endswith('/') or '.' not in name
+    
+    async def scan_async(self, frontier, status_codes, concurrency, per_host_limit=None,
+                         timeout=(DEFAULT_CONNECT_TIMEOUT, 10), verify_ssl=True):
+        """Motor de escaneo asíncrono: un solo event loop con miles de requests en vuelo
+        
+        `timeout` es la tupla (conexión, lectura) en segundos, como en requests.
+        """
+        if self.http2:
+            client = self.create_http2_client(concurrency, timeout, verify_ssl)
+            check_directory = self.check_directory_h2
+        else:
+            connector = aiohttp.TCPConnector(
+                limit=concurrency,
+                limit_per_host=per_host_limit or concurrency,
+                # Contexto propio: el de requests lo modifica urllib3 durante la calibración
+                ssl=self.create_ssl_context(verify_ssl),
+                force_close=not self.pool_settings.get('keep_alive', True),
+                # La caché DNS es la del proceso (TTL e IPs fijadas compartidos con el motor de threads)
+                resolver=CachedDNSResolver(),
+                use_dns_cache=False
+            )
+            client = aiohttp.ClientSession(
+                connector=connector,
+                # Sin límite total: un request lento pero vivo no se corta mientras lleguen datos
+                timeout=aiohttp.ClientTimeout(total=None, sock_connect=timeout[0], sock_read=timeout[1]),
+                headers=dict(self.session.headers),
+                trace_configs=[self.profiler.trace_config()] if self.profiler is not None else None
+            )
+            check_directory = self.check_directory_async
+        completed = 0
+        active = 0
+        finished = False
+        work_changed = asyncio.Condition()
+        loop = asyncio.get_running_loop()
+        
+        async with client as http:
+            
+            async def worker():
+                nonlocal completed, active, finished
+                # Cada worker toma el siguiente trabajo de la frontera compartida,
+                # así nunca hay más de `concurrency` requests en memoria
+                while not self.stop_scanning:
+                    self.poll_shard_work(frontier)
+                    job = frontier.next_job()
+                    if job is None:
+                        delay = frontier.retry_delay()
+                        if delay is not None:
+                            # Solo quedan reintentos que aún no toca enviar
+                            await asyncio.sleep(delay)
+                            continue
+                        # Sin trabajo: terminar si nadie más puede descubrir directorios
+                        async with work_changed:
+                            if finished:
+                                break
+                            if active > 0:
+                                await work_changed.wait()
+                                continue
+                            if self.shard_link is None:
+                                finished = True
+                                work_changed.notify_all()
+                                break
+                            active += 1
+                        # Worker de --processes: esperar directorios de los demás procesos
+                        more = await loop.run_in_executor(None, self.wait_shard_work, frontier)
+                        async with work_changed:
+                            active -= 1
+                            finished = not more
+                            work_changed.notify_all()
+                        continue
                     
-                future = executor.submit(
-                    self.check_directory, 
-                    target_url, 
-                    directory, 
-                    status_codes, 
-                    delay
-                )
-                futures.append(future)
+                    base_url, directory, depth, offset, word = job
+                    active += 1
+                    try:
+                        try:
+                            result = await check_directory(
+                                http, base_url, directory, status_codes
+                            )
+                        except Exception as e:
+                            # Un fallo inesperado en una ruta no debe tumbar al resto de workers
+                            self.stats.record_error()
+                            self.logger.debug(f"Error inesperado en {base_url}/{directory}: {e}")
+                            result = False
+                        finally:
+                            completed += 1
+                            frontier.job_done(job)
+                        self.complete_job(job, result, frontier)
+                        self.print_progress(completed, frontier.total_jobs)
+                    finally:
+                        active -= 1
+                        async with work_changed:
+                            work_changed.notify_all()
+            
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+    
+    def scan_processes(self, frontier, wordlist_path, processes, options):
+        """Repartir la wordlist entre varios procesos worker y recoger sus resultados
+        
+        Cada proceso ejecuta su propio motor de I/O sobre las entradas con
+        offset % processes == índice. Los hallazgos llegan aquí, donde se muestran,
+        se escriben y, en modo recursivo, se reparten los nuevos directorios a todos.
+        """
+        # La concurrencia y la tasa indicadas son globales: se dividen entre los procesos
+        options = dict(
+            options,
+            threads=max(1, options['threads'] // processes),
+            per_host_limit=max(1, math.ceil(options['per_host_limit'] / processes)),
+            max_depth=frontier.max_depth,
+            interleave=frontier.interleave,
+            probe=self.probe_mode,
+            wildcard_filters=self.wildcard_filters,
+            resume_state=frontier.resume_state,
+            track_completed=self.journal is not None,
+            expansion=frontier.wordlist.config() if isinstance(frontier.wordlist, WordlistExpansion) else None,
+            priority=getattr(self.base_wordlist(frontier.wordlist), 'priority', None),
+            response_cache=((self.response_cache.path, self.response_cache.ttl, self.response_cache.max_entries)
+                            if self.response_cache is not None else None),
+            max_jobs=math.ceil(frontier.max_jobs / processes) if frontier.max_jobs else None,
+            max_retries=frontier.max_retries,
+            retry_limit=math.ceil(frontier.retry_limit / processes),
+            retry_concurrency=math.ceil(frontier.retry_concurrency / processes),
+            rate=self.rate_limiter.rate / processes if self.rate_limiter is not None else None,
+            adaptive=self.rate_limiter is not None and self.rate_limiter.adaptive,
+            max_rate=self.rate_limiter.max_rate / processes if self.rate_limiter is not None else None
+        )
+        directories = [(url, depth) for depth, _, url in sorted(frontier.heap)]
+        
+        context = multiprocessing.get_context()
+        events = context.Queue()
+        commands = [context.Queue() for _ in range(processes)]
+        workers = [
+            context.Process(target=run_shard, daemon=True,
+                            args=(index, processes, wordlist_path, directories, options,
+                                  events, commands[index]))
+            for index in range(processes)
+        ]
+        for worker in workers:
+            worker.start()
+        
+        slots = [self.stats.remote_worker() for _ in workers]
+        # Estado de cada worker (busy, idle o done) y directorios que ha recibido
+        states = [('busy', 0)] * processes
+        sent = 0
+        stopping = False
+        
+        def stop_workers():
+            for command_queue in commands:
+                command_queue.put(('stop',))
+        
+        try:
+            while any(state != 'done' for state, _ in states):
+                if self.stop_scanning and not stopping:
+                    stop_workers()
+                    stopping = True
+                
+                try:
+                    index, batch, snapshot, state, received = events.get(timeout=0.5)
+                except queue.Empty:
+                    # Un worker que muere sin avisar no debe bloquear el escaneo
+                    for index, worker in enumerate(workers):
+                        if not worker.is_alive() and states[index][0] != 'done':
+                            self.logger.error(f"El proceso worker {index} terminó inesperadamente "
+                                              f"(código {worker.exitcode})")
+                            states[index] = ('done', sent)
+                    continue
                 
-                # Mostrar progreso cada 10 requests
-                if (i + 1) % 10 == 0:
-                    self.print_progress(i + 1, len(directories))
+                slots[index].load(snapshot)
+                states[index] = (state, received)
+                for event in batch:
+                    if event[0] == 'result':
+                        _, result, base_url, depth, word = event
+                        self.stats.add_result(result)
+                        child = self.handle_found(result, base_url, depth, frontier, word)
+                        if child is not None:
+                            sent += 1
+                            for command_queue in commands:
+                                command_queue.put(('directory', child, depth + 1, base_url))
+                    elif self.journal is not None:
+                        self.journal.record_completed(*event[1:])
+                
+                self.print_progress(self.stats.completed_requests, frontier.total_jobs)
+                
+                # Todos ociosos y al día: nadie puede descubrir más directorios
+                if not stopping and all(state == 'done' or (state == 'idle' and received == sent)
+                                        for state, received in states):
+                    stop_workers()
+                    stopping = True
+        finally:
+            for worker in workers:
+                worker.join(timeout=5)
+                if worker.is_alive():
+                    worker.terminate()
+    
+    def run_shard(self, index, processes, wordlist_path, directories, options):
+        """Escanear la parte de la wordlist que corresponde a este proceso worker"""
+        try:
+            self.setup_session(
+                user_agent=options['user_agent'],
+                timeout=options['timeout'],
+                verify_ssl=options['verify_ssl'],
+                pool_size=options['pool_size'] or options['per_host_limit'],
+                keep_alive=options['keep_alive'],
+                tls_session_reuse=options['tls_session_reuse'],
+                hosts=options['hosts'],
+                resolve=options['resolve'],
+                dns_ttl=options['dns_ttl'],
+                connect_timeout=options['connect_timeout']
+            )
+            if options['rate']:
+                self.rate_limiter = RateLimiter(options['rate'], adaptive=options['adaptive'],
+                                                max_rate=options['max_rate'])
+            self.probe_mode = options['probe']
+            self.http2 = options['http2']
+            self.wildcard_filters = options['wildcard_filters']
+            self.breaker_settings = options['breaker_settings']
+            if options['response_cache'] is not None:
+                self.response_cache = ResponseCache(*options['response_cache']).open()
+            # Los resultados se envían al proceso principal, no se acumulan aquí
+            self.stats.keep_results = False
             
-            # Esperar resultados
-            for future in as_completed(futures):
-                if self.stop_scanning:
+            if CompiledWordlist.is_compiled(wordlist_path):
+                wordlist = CompiledWordlist(wordlist_path)
+            else:
+                wordlist = Wordlist(wordlist_path, dedup=options['dedup'])
+            if options['priority'] is not None:
+                wordlist = PrioritizedWordlist(wordlist, options['priority'])
+            if options['expansion']:
+                wordlist = WordlistExpansion(wordlist, **options['expansion'])
+            frontier = ScanFrontier(wordlist, options['max_depth'],
+                                    interleave=options['interleave'],
+                                    per_host_limit=options['per_host_limit'],
+                                    shard=(index, processes))
+            frontier.resume_state = options['resume_state']
+            frontier.max_jobs = options['max_jobs']
+            frontier.max_retries = options['max_retries']
+            frontier.retry_limit = options['retry_limit']
+            frontier.retry_concurrency = options['retry_concurrency']
+            for url, depth in directories:
+                frontier.add(url, depth)
+            
+            if options['engine'] == 'async':
+                asyncio.run(self.scan_async(frontier, options['status_codes'], options['threads'],
+                                            options['per_host_limit'], self.timeouts,
+                                            options['verify_ssl']))
+            else:
+                self.scan_threads(frontier, options['status_codes'], options['threads'],
+                                  options['window'] or options['threads'] * 4)
+        finally:
+            if self.response_cache is not None:
+                self.response_cache.close()
+            self.shard_link.flush(self.stats, state='done')
+    
+    def run_coordinator(self, frontier, status_codes, address, chunk_size=500, lease_timeout=60.0,
+                        token=None):
+        """Modo coordinador: servir chunks de la frontera a workers remotos hasta terminar"""
+        host, _, port = address.rpartition(':')
+        # Los límites por host los aplica cada worker; aquí solo se reparte trabajo
+        frontier.per_host_limit = None
+        coordinator = ScanCoordinator(self, frontier, status_codes, chunk_size, lease_timeout, token)
+        server = ThreadingHTTPServer((host or '0.0.0.0', int(port)), CoordinatorHandler)
+        server.daemon_threads = True
+        server.coordinator = coordinator
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        print(f"{Fore.BLUE}Coordinador escuchando en http://{host or '0.0.0.0'}:{server.server_address[1]} "
+              f"(chunks de {chunk_size}, lease de {lease_timeout:.0f}s){Style.RESET_ALL}")
+        
+        try:
+            while not self.stop_scanning and not coordinator.finished():
+                time.sleep(0.5)
+                self.print_progress(self.stats.completed_requests, frontier.total_jobs)
+            # Margen para que los workers que sondean reciban la orden de terminar
+            time.sleep(2.0)
+        finally:
+            server.shutdown()
+            server.server_close()
+        
+        print(f"\n{Fore.BLUE}Chunks completados: {coordinator.chunks_completed}, reasignados: "
+              f"{coordinator.chunks_reassigned}, workers: {len(coordinator.workers)}{Style.RESET_ALL}")
+    
+    def run_worker(self, coordinator_url, **kwargs):
+        """Modo worker: pedir chunks al coordinador, escanearlos y enviar los resultados"""
+        self.setup_session(
+            user_agent=kwargs.get('user_agent'),
+            timeout=kwargs.get('timeout', 10),
+            verify_ssl=kwargs.get('verify_ssl', True),
+            pool_size=kwargs.get('pool_size') or kwargs.get('threads', 10),
+            keep_alive=kwargs.get('keep_alive', True),
+            tls_session_reuse=kwargs.get('tls_session_reuse', False),
+            resolve=kwargs.get('resolve'),
+            dns_ttl=kwargs.get('dns_ttl'),
+            connect_timeout=kwargs.get('connect_timeout')
+        )
+        rate = kwargs.get('rate')
+        if kwargs.get('adaptive') and not rate:
+            rate = kwargs.get('threads', 10) * 10
+        if rate:
+            self.rate_limiter = RateLimiter(rate, adaptive=kwargs.get('adaptive', False),
+                                            max_rate=kwargs.get('max_rate') or 10000.0)
+        self.setup_circuit_breaker(kwargs.get('breaker_threshold', DEFAULT_BREAKER_THRESHOLD),
+                                   kwargs.get('abort_after', DEFAULT_ABORT_AFTER))
+        self.probe_mode = kwargs.get('probe', 'get')
+        self.http2 = kwargs.get('http2', False)
+        engine = 'async' if self.http2 else kwargs.get('engine', 'threads')
+        if not self.engine_available(engine):
+            return False
+        
+        coordinator_url = self.validate_url(coordinator_url)
+        if not coordinator_url:
+            return False
+        worker = f"{socket.gethostname()}-{os.getpid()}"
+        # Sesión propia para la API del coordinador (sin los headers del escaneo)
+        api = requests.Session()
+        if kwargs.get('token'):
+            api.headers['X-DirForcer-Token'] = kwargs['token']
+        
+        print(f"{Fore.BLUE}Worker {worker} conectado a {coordinator_url} "
+              f"(motor: {engine}{', HTTP/2' if self.http2 else ''}){Style.RESET_ALL}")
+        chunks = requests_done = failures = 0
+        while not self.stop_scanning:
+            try:
+                response = api.post(f"{coordinator_url}/lease", json={'worker': worker}, timeout=10)
+                if response.status_code == 403:
+                    self.logger.error("El coordinador rechazó el token (--token)")
                     break
-                result = future.result()
-                if result:
-                    print(f"\n{Fore.GREEN}[+] Encontrado: {result['url']} ({result['status_code']}){Style.RESET_ALL}")
+                response.raise_for_status()
+                lease = response.json()
+                failures = 0
+            except (requests.exceptions.RequestException, ValueError) as e:
+                # El coordinador cierra al terminar: unos reintentos y salir
+                failures += 1
+                if failures >= 5:
+                    self.logger.error(f"Coordinador no disponible: {e}")
+                    break
+                time.sleep(1.0)
+                continue
+            
+            if lease.get('done'):
+                break
+            if 'wait' in lease:
+                time.sleep(lease['wait'])
+                continue
+            
+            if self.run_chunk(api, coordinator_url, worker, lease, engine, kwargs):
+                chunks += 1
+                requests_done += len(lease['jobs'])
         
+        print(f"\n{Fore.GREEN}Worker terminado: {chunks} chunks, {requests_done} requests{Style.RESET_ALL}")
         return True
+    
+    def run_chunk(self, api, coordinator_url, worker, lease, engine, options):
+        """Escanear un chunk manteniendo vivo su lease y enviar el resultado"""
+        # Métricas por chunk: el coordinador las acumula por worker
+        self.stats = ScanStats()
+        for base_url, data in lease['wildcard'].items():
+            self.wildcard_filters[base_url] = WildcardFilter.from_dict(data)
+        frontier = ChunkFrontier([tuple(job) for job in lease['jobs']])
+        frontier.max_retries = options.get('retries', DEFAULT_RETRIES)
+        max_workers = options.get('threads', 10)
+        
+        # Renovar el lease mientras se escanea (chunks lentos o con rate limit)
+        finished = threading.Event()
+        
+        def heartbeat():
+            while not finished.wait(lease['lease_timeout'] / 3):
+                try:
+                    api.post(f"{coordinator_url}/heartbeat", json={'chunk': lease['chunk']}, timeout=10)
+                except requests.exceptions.RequestException as e:
+                    self.logger.debug(f"Error al renovar el lease: {e}")
+        
+        threading.Thread(target=heartbeat, daemon=True).start()
+        try:
+            if engine == 'async':
+                asyncio.run(self.scan_async(frontier, lease['status_codes'], max_workers, None,
+                                            self.timeouts, options.get('verify_ssl', True)))
+            else:
+                self.scan_threads(frontier, lease['status_codes'], max_workers, max_workers * 4)
+        finally:
+            finished.set()
+        
+        # Un chunk interrumpido no se envía: su lease vencerá y se reasignará
+        if self.stop_scanning:
+            return False
+        try:
+            response = api.post(f"{coordinator_url}/complete", timeout=30, json={
+                'worker': worker,
+                'chunk': lease['chunk'],
+                'results': self.stats.results,
+                'stats': self.stats.snapshot()
+            })
+        except requests.exceptions.RequestException as e:
+            self.logger.error(f"Error al enviar el chunk al coordinador: {e}")
+            return False
+        if response.status_code == 409:
+            self.logger.warning("El lease del chunk venció antes de completarlo; se descarta")
+            return False
+        return response.ok
+    
+    def print_found(self, result):
+        """Mostrar un directorio encontrado"""
+        print(f"\n{Fore.GREEN}[+] Encontrado: {result['url']} ({result['status_code']}){Style.RESET_ALL}")
+
+def run_shard(index, processes, wordlist_path, directories, options, events, commands):
+    """Punto de entrada de cada proceso worker de --processes"""
+    # Solo el proceso principal muestra la salida y atiende Ctrl+C
+    sys.stdout = open(os.devnull, 'w')
+    dirforcer = DirForcerPro()
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    dirforcer.shard_link = ShardLink(index, events, commands, options['track_completed'])
+    dirforcer.run_shard(index, processes, wordlist_path, directories, options)
+
+def load_targets(path):
+    """Leer objetivos de un archivo, ignorando líneas vacías y comentarios"""
+    try:
+        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+            return [line.strip() for line in f if line.strip() and not line.startswith('#')]
+    except FileNotFoundError:
+        print(f"{Fore.RED}Error: Archivo de objetivos '{path}' no encontrado{Style.RESET_ALL}")
+        return []
+
+def parse_resolve(values):
+    """Convertir las opciones --resolve HOST:IP en un diccionario host -> IP"""
+    pinned = {}
+    for value in values:
+        host, _, ip = value.partition(':')
+        try:
+            ipaddress.ip_address(ip.strip('[]'))
+        except ValueError:
+            raise ValueError(f"--resolve espera HOST:IP, no {value!r}")
+        if not host:
+            raise ValueError(f"--resolve espera HOST:IP, no {value!r}")
+        pinned[host] = ip.strip('[]')
+    return pinned
+
 
 def main():
     parser = argparse.ArgumentParser(
@@ -329,22 +4001,124 @@ Ejemplos de uso:
   python dirforcer_improved.py -d example.com -w directorios.txt
   python dirforcer_improved.py -d https://example.com -w wordlist.txt -t 20 -o results.json
   python dirforcer_improved.py -d example.com -w common.txt --delay 0.1 --status-codes 200 403
+  python dirforcer_improved.py -d example.com -w big.txt --engine async -t 1000
+  python dirforcer_improved.py -d https://example.com -w big.txt --http2 -t 500
+  python dirforcer_improved.py -d example.com -w common.txt -x php,bak,txt --mutations case,backup
+  python dirforcer_improved.py --targets-file hosts.txt -w common.txt -t 50 --per-host-limit 5
+  python dirforcer_improved.py -d example.com -w big.txt --coordinator 0.0.0.0:8700
+  python dirforcer_improved.py --worker http://coordinador:8700 -t 50
+  python dirforcer_improved.py -d example.com -w common.txt --profile-output scan.json
+  python dirforcer_improved.py -d example.com -w big.txt --incremental --cache-ttl 24
 
 Desarrollado por: NEZUKO
 Versión: 2.0 Pro
         """
     )
     
-    parser.add_argument("-d", "--domain", dest="domain", required=True,
+    targets = parser.add_mutually_exclusive_group()
+    targets.add_argument("-d", "--domain", dest="domain",
                        help="Dominio objetivo para escanear")
-    parser.add_argument("-w", "--wordlist", dest="wordlist", required=True,
+    targets.add_argument("--targets-file", dest="targets_file",
+                       help="Archivo con un objetivo por línea; todos comparten wordlist y pool de workers")
+    parser.add_argument("-w", "--wordlist", dest="wordlist",
                        help="Archivo de wordlist con directorios a probar")
     parser.add_argument("-t", "--threads", dest="threads", type=int, default=10,
                        help="Número de threads concurrentes (default: 10)")
+    parser.add_argument("--probe", dest="probe", choices=["get", "head", "stream"], default="get",
+                       help="Modo de sondeo: get (descarga completa), head (HEAD con respaldo a GET) "
+                            "o stream (GET que solo lee el cuerpo si falta Content-Length) (default: get)")
+    parser.add_argument("--per-host-limit", dest="per_host_limit", type=int,
+                       help="Requests simultáneos máximos por host (default: --threads, o min(--threads, 10) "
+                            "con --targets-file)")
+    parser.add_argument("--pool-size", dest="pool_size", type=int,
+                       help="Conexiones máximas por host en el pool (default: igual a --threads)")
+    parser.add_argument("--no-keep-alive", dest="keep_alive", action="store_false",
+                       help="Cerrar la conexión tras cada request en lugar de reutilizarla")
+    parser.add_argument("--tls-session-reuse", dest="tls_session_reuse", action="store_true",
+                       help="Reanudar sesiones TLS en conexiones nuevas (evita handshakes completos)")
+    parser.add_argument("--resolve", dest="resolve", action="append", metavar="HOST:IP",
+                       help="Conectar a IP para HOST sin consultar el DNS (repetible)")
+    parser.add_argument("--dns-ttl", dest="dns_ttl", type=float, default=300.0,
+                       help="Segundos que se conserva cada resolución DNS en caché (default: 300)")
+    parser.add_argument("--no-calibrate", dest="calibrate", action="store_false",
+                       help="No detectar respuestas wildcard / soft-404 antes del escaneo")
+    parser.add_argument("--recursive", dest="recursive", action="store_true",
+                       help="Escanear recursivamente los directorios descubiertos (200/301)")
+    parser.add_argument("--max-depth", dest="max_depth", type=int, default=2,
+                       help="Profundidad máxima del escaneo recursivo (default: 2)")
+    parser.add_argument("--checkpoint", dest="checkpoint",
+                       help="Diario de checkpoint donde se va guardando el progreso del escaneo")
+    parser.add_argument("--resume", dest="resume", action="store_true",
+                       help=f"Reanudar desde el checkpoint (default: {DEFAULT_CHECKPOINT})")
+    parser.add_argument("--dedup", dest="dedup", action="store_true",
+                       help="Descartar entradas duplicadas de la wordlist")
+    parser.add_argument("-x", "--extensions", dest="extensions", type=lambda value: value.split(','),
+                       help="Extensiones a probar para cada entrada, separadas por comas (p. ej. php,bak,txt)")
+    parser.add_argument("--patterns", dest="patterns", nargs="+",
+                       help="Plantillas de expansión con {word} y {ext} "
+                            "(default: {word} y, con -x, {word}.{ext})")
+    parser.add_argument("--mutations", dest="mutations", type=lambda value: value.split(','),
+                       help="Mutaciones separadas por comas: case (minúsculas, mayúsculas, capitalizada) "
+                            "y backup (~, .bak, .old y .swp de cada archivo)")
+    parser.add_argument("--prioritize", dest="prioritize", action="store_true",
+                       help="Probar primero las entradas con más aciertos en escaneos anteriores")
+    parser.add_argument("--max-requests", dest="max_requests", type=int,
+                       help="Presupuesto de requests del escaneo (con --prioritize se gasta en las "
+                            "entradas más productivas)")
+    parser.add_argument("--hit-stats", dest="hit_stats", nargs="?", const=DEFAULT_HIT_STATS, metavar="ARCHIVO",
+                       help=f"Guardar los aciertos del escaneo para --prioritize (por defecto en "
+                            f"{DEFAULT_HIT_STATS}; --prioritize lo activa)")
+    parser.add_argument("--no-hit-stats", dest="hit_stats", action="store_const", const=False,
+                       help="No leer ni actualizar las estadísticas de aciertos (ni con --prioritize)")
+    parser.add_argument("--incremental", dest="incremental", action="store_true",
+                       help="Reutilizar la caché de respuestas de escaneos anteriores: omitir los negativos "
+                            "recientes y revalidar los aciertos con requests condicionales")
+    parser.add_argument("--response-cache", dest="response_cache", default=DEFAULT_RESPONSE_CACHE, metavar="ARCHIVO",
+                       help=f"Base de datos de la caché de respuestas (default: {DEFAULT_RESPONSE_CACHE})")
+    parser.add_argument("--cache-ttl", dest="cache_ttl", type=float, default=DEFAULT_CACHE_TTL / 3600,
+                       metavar="HORAS",
+                       help="Vigencia de las respuestas en caché; pasado ese tiempo se vuelven a pedir "
+                            f"(default: {DEFAULT_CACHE_TTL // 3600})")
+    parser.add_argument("--cache-size", dest="cache_size", type=int, default=DEFAULT_CACHE_SIZE,
+                       help=f"Respuestas máximas en caché; se descartan las usadas hace más tiempo "
+                            f"(default: {DEFAULT_CACHE_SIZE})")
+    parser.add_argument("--processes", dest="processes", type=int, default=1,
+                       help="Procesos worker entre los que se reparte la wordlist; -t y --rate son "
+                            "totales y se dividen entre ellos (default: 1)")
+    parser.add_argument("--engine", dest="engine", choices=["threads", "async"], default="threads",
+                       help="Motor de escaneo: threads (ThreadPoolExecutor) o async (asyncio + aiohttp). "
+                            "Con async, -t indica requests concurrentes (default: threads)")
+    parser.add_argument("--http2", dest="http2", action="store_true",
+                       help="Multiplexar los requests sobre conexiones HTTP/2 (motor async con httpx; "
+                            "requiere HTTPS y pip install 'httpx[http2]')")
     parser.add_argument("--delay", dest="delay", type=float, default=0,
-                       help="Delay entre requests en segundos (default: 0)")
+                       help="Delay global entre requests en segundos; equivale a --rate 1/DELAY (default: 0)")
+    parser.add_argument("--rate", dest="rate", type=float,
+                       help="Límite global de requests por segundo (token bucket)")
+    parser.add_argument("--adaptive", dest="adaptive", action="store_true",
+                       help="Ajustar la tasa según latencia, timeouts y respuestas 429/503 (AIMD)")
+    parser.add_argument("--max-rate", dest="max_rate", type=float,
+                       help="Tasa máxima que puede alcanzar el modo adaptativo (default: 10000)")
+    parser.add_argument("--breaker-threshold", dest="breaker_threshold", type=int, default=DEFAULT_BREAKER_THRESHOLD,
+                       help="Errores de conexión o timeouts seguidos que pausan un host; mientras está "
+                            f"pausado se prueba su recuperación con backoff exponencial (0 desactiva; "
+                            f"default: {DEFAULT_BREAKER_THRESHOLD})")
+    parser.add_argument("--abort-after", dest="abort_after", type=float, default=DEFAULT_ABORT_AFTER,
+                       metavar="SEGUNDOS",
+                       help=f"Abandonar un host que lleva este tiempo sin responder (default: {DEFAULT_ABORT_AFTER:.0f})")
     parser.add_argument("--timeout", dest="timeout", type=int, default=10,
-                       help="Timeout para requests en segundos (default: 10)")
+                       help="Timeout de lectura en segundos: tiempo máximo sin recibir datos (default: 10)")
+    parser.add_argument("--connect-timeout", dest="connect_timeout", type=float,
+                       help=f"Timeout de conexión en segundos (default: el menor entre --timeout y "
+                            f"{DEFAULT_CONNECT_TIMEOUT:g})")
+    parser.add_argument("--retries", dest="retries", type=int, default=DEFAULT_RETRIES,
+                       help="Reintentos por ruta ante errores de conexión, timeouts y respuestas 429/502/503/504; "
+                            f"se hacen al final del escaneo, con backoff y jitter (0 desactiva; default: {DEFAULT_RETRIES})")
+    parser.add_argument("--retry-queue-size", dest="retry_queue_size", type=int, default=DEFAULT_RETRY_QUEUE_SIZE,
+                       help=f"Rutas máximas en la cola de reintentos (default: {DEFAULT_RETRY_QUEUE_SIZE})")
+    parser.add_argument("--retry-concurrency", dest="retry_concurrency", type=int,
+                       default=DEFAULT_RETRY_CONCURRENCY,
+                       help=f"Reintentos simultáneos al vaciar la cola (default: {DEFAULT_RETRY_CONCURRENCY})")
     parser.add_argument("--user-agent", dest="user_agent",
                        help="User-Agent personalizado")
     parser.add_argument("--no-ssl-verify", dest="verify_ssl", action="store_false",
@@ -353,11 +4127,52 @@ Versión: 2.0 Pro
                        default=[200, 301, 302, 403, 401],
                        help="Códigos de estado HTTP de interés (default: 200 301 302 403 401)")
     parser.add_argument("-o", "--output", dest="output_file",
-                       help="Archivo de salida para guardar resultados (JSON)")
+                       help="Archivo de salida para guardar resultados (JSON, JSON Lines o CSV)")
+    parser.add_argument("--output-format", dest="output_format", choices=["json", "jsonl", "csv"],
+                       help="Formato de salida; jsonl y csv se escriben en streaming durante el escaneo "
+                            "(default: según la extensión de -o)")
+    parser.add_argument("--coordinator", dest="coordinator", metavar="HOST:PUERTO",
+                       help="Modo coordinador: repartir el escaneo en chunks entre workers remotos")
+    parser.add_argument("--worker", dest="worker", metavar="URL",
+                       help="Modo worker: pedir chunks al coordinador indicado y escanearlos")
+    parser.add_argument("--chunk-size", dest="chunk_size", type=int, default=500,
+                       help="Requests por chunk en modo coordinador (default: 500)")
+    parser.add_argument("--lease-timeout", dest="lease_timeout", type=float, default=60.0,
+                       help="Segundos sin noticias de un worker antes de reasignar su chunk (default: 60)")
+    parser.add_argument("--token", dest="token",
+                       help="Secreto compartido entre coordinador y workers")
+    parser.add_argument("--profile", dest="profile", action="store_true",
+                       help="Medir el tiempo de cada request por fase (cola, DNS, TCP, TLS, espera, "
+                            "lectura, Python) y mostrar el reparto al final")
+    parser.add_argument("--profile-output", dest="profile_output", metavar="ARCHIVO",
+                       help="Guardar el perfil: traza Chrome si termina en .json, volcado pstats (cProfile) "
+                            "en otro caso; implica --profile")
     parser.add_argument("-v", "--verbose", dest="verbose", action="store_true",
                        help="Modo verbose para más información")
     
     args = parser.parse_args()
+    if not args.worker and not (args.domain or args.targets_file):
+        parser.error("se requiere -d/--domain o --targets-file")
+    if not args.worker and not args.wordlist:
+        parser.error("se requiere -w/--wordlist")
+    unknown = set(args.mutations or ()) - set(WordlistExpansion.MUTATIONS)
+    if args.max_requests is not None and args.max_requests < 1:
+        parser.error("--max-requests debe ser mayor que 0")
+    if args.breaker_threshold < 0 or args.abort_after <= 0:
+        parser.error("--breaker-threshold no puede ser negativo y --abort-after debe ser mayor que 0")
+    if args.connect_timeout is not None and args.connect_timeout <= 0:
+        parser.error("--connect-timeout debe ser mayor que 0")
+    if args.retries < 0 or args.retry_queue_size < 1 or args.retry_concurrency < 1:
+        parser.error("--retries no puede ser negativo; --retry-queue-size y --retry-concurrency deben ser mayores que 0")
+    if args.cache_ttl <= 0 or args.cache_size < 1:
+        parser.error("--cache-ttl y --cache-size deben ser mayores que 0")
+    try:
+        resolve = parse_resolve(args.resolve or ())
+    except ValueError as e:
+        parser.error(str(e))
+    if unknown:
+        parser.error(f"mutaciones desconocidas: {', '.join(sorted(unknown))} "
+                     f"(disponibles: {', '.join(WordlistExpansion.MUTATIONS)})")
     
     # Configurar logging según verbosidad
     if args.verbose:
@@ -367,16 +4182,94 @@ Versión: 2.0 Pro
     dirforcer = DirForcerPro()
     dirforcer.print_banner()
     
+    # Modo worker: el objetivo y la wordlist los reparte el coordinador
+    if args.worker:
+        success = dirforcer.run_worker(
+            args.worker,
+            threads=args.threads,
+            engine=args.engine,
+            http2=args.http2,
+            probe=args.probe,
+            pool_size=args.pool_size,
+            keep_alive=args.keep_alive,
+            tls_session_reuse=args.tls_session_reuse,
+            resolve=resolve,
+            dns_ttl=args.dns_ttl,
+            rate=args.rate or (1.0 / args.delay if args.delay > 0 else None),
+            adaptive=args.adaptive,
+            max_rate=args.max_rate,
+            breaker_threshold=args.breaker_threshold,
+            abort_after=args.abort_after,
+            retries=args.retries,
+            timeout=args.timeout,
+            connect_timeout=args.connect_timeout,
+            user_agent=args.user_agent,
+            verify_ssl=args.verify_ssl,
+            token=args.token
+        )
+        sys.exit(0 if success else 1)
+    
+    # Objetivos: un dominio o un archivo con uno por línea
+    target = args.domain
+    if args.targets_file:
+        target = load_targets(args.targets_file)
+        if not target:
+            print(f"{Fore.RED}No hay objetivos en {args.targets_file}{Style.RESET_ALL}")
+            sys.exit(1)
+    
     # Realizar escaneo
     success = dirforcer.scan(
-        target_url=args.domain,
+        target_url=target,
         wordlist_path=args.wordlist,
         threads=args.threads,
+        per_host_limit=args.per_host_limit,
+        processes=args.processes,
+        coordinator=args.coordinator,
+        chunk_size=args.chunk_size,
+        lease_timeout=args.lease_timeout,
+        token=args.token,
+        engine=args.engine,
+        http2=args.http2,
+        dedup=args.dedup,
+        prioritize=args.prioritize,
+        max_requests=args.max_requests,
+        hit_stats=args.hit_stats,
+        incremental=args.incremental,
+        response_cache=args.response_cache,
+        cache_ttl=args.cache_ttl * 3600,
+        cache_size=args.cache_size,
+        extensions=args.extensions,
+        patterns=args.patterns,
+        mutations=args.mutations,
+        probe=args.probe,
+        calibrate=args.calibrate,
+        recursive=args.recursive,
+        checkpoint=args.checkpoint,
+        output_file=args.output_file,
+        output_format=args.output_format,
+        resume=args.resume,
+        max_depth=args.max_depth,
+        pool_size=args.pool_size,
+        keep_alive=args.keep_alive,
+        tls_session_reuse=args.tls_session_reuse,
+        resolve=resolve,
+        dns_ttl=args.dns_ttl,
         delay=args.delay,
+        rate=args.rate,
+        adaptive=args.adaptive,
+        max_rate=args.max_rate,
+        breaker_threshold=args.breaker_threshold,
+        abort_after=args.abort_after,
+        retries=args.retries,
+        retry_queue_size=args.retry_queue_size,
+        retry_concurrency=args.retry_concurrency,
         timeout=args.timeout,
+        connect_timeout=args.connect_timeout,
         user_agent=args.user_agent,
         verify_ssl=args.verify_ssl,
-        status_codes=args.status_codes
+        status_codes=args.status_codes,
+        profile=args.profile,
+        profile_output=args.profile_output
     )
     
     if success: